@@ -9,6 +9,7 @@
 # - JSON metadata export for each generation
 # - CUDA memory management and cleanup
 # - Attention slicing for reduced memory usage
+# - Batched multi-prompt generation sized to free VRAM, with smaller batches on out-of-memory errors
 
 # ## Import dependencies and configure GPU resources
 
@@ -29,32 +30,106 @@ gpu_config = LiveServerless(
     hf_models_to_cache=["runwayml/stable-diffusion-v1-5"],
 )
 class SimpleSD:
-    def __init__(self):
+    def __init__(self, warmup=False):
+        import time
+
+        # Cold-start phases, returned by get_startup_report()
+        started = time.perf_counter()
+        phases = {}
+
         from diffusers import StableDiffusionPipeline
         import torch
         import gc
+        phases["imports_s"] = time.perf_counter() - started
 
         print("Initializing compact Stable Diffusion model...")
 
-        self.pipe = StableDiffusionPipeline.from_pretrained(
+        # Fetch only the files the pipeline needs (a no-op on a cache hit); components
+        # passed as None, like the ~1.2GB safety checker, are skipped
+        model_cache = self._model_cache_state("runwayml/stable-diffusion-v1-5", "model_index.json")
+        mark = time.perf_counter()
+        model_path = StableDiffusionPipeline.download(
             "runwayml/stable-diffusion-v1-5",
+            safety_checker=None,
+            requires_safety_checker=False,
+        )
+        phases["download_s"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        self.pipe = StableDiffusionPipeline.from_pretrained(
+            model_path,
             torch_dtype=torch.float16,
             safety_checker=None,  # Disable to save memory
             requires_safety_checker=False,
             low_cpu_mem_usage=True,  # Additional memory optimization
         )
+        phases["weight_load_s"] = time.perf_counter() - mark
 
         # Move to GPU and optimize
+        mark = time.perf_counter()
         self.pipe = self.pipe.to("cuda")
+        torch.cuda.synchronize()
+        phases["device_transfer_s"] = time.perf_counter() - mark
         # self.pipe.enable_xformers_memory_efficient_attention()
         self.pipe.enable_attention_slicing()  # Additional memory saving
 
+        if warmup:
+            mark = time.perf_counter()
+            self.pipe(prompt="warmup", num_inference_steps=1, width=256, height=256)
+            phases["warmup_s"] = time.perf_counter() - mark
+
         # Clean up any leftover memory
         gc.collect()
         torch.cuda.empty_cache()
 
+        self.startup_report = self._startup_report("SimpleSD", started, phases, model_cache)
+
         print("Compact Stable Diffusion initialized successfully!")
 
+    @staticmethod
+    def _startup_report(name: str, started: float, phases: dict, model_cache: str, combined_phases=None):
+        """Summarize and log where instance startup time went"""
+        import json
+        import os
+        import time
+
+        init_s = time.perf_counter() - started
+        try:
+            # How long this process had run when __init__ began, where /proc is available.
+            # On a reused worker that is its whole lifetime, not boot or install time.
+            process_age_s = time.time() - os.stat(f"/proc/{os.getpid()}").st_ctime - init_s
+        except OSError:
+            process_age_s = None
+
+        report = {
+            "class": name,
+            "process_age_s": process_age_s,
+            "phases": phases,
+            # Phases the loading library performs in one call, so they cannot be timed apart
+            "combined_phases": combined_phases or {},
+            "model_cache": model_cache,
+            "init_s": init_s,
+        }
+        print(f"Startup report: {json.dumps(report)}")
+        return report
+
+    @staticmethod
+    def _model_cache_state(repo_id: str, filename: str):
+        """Whether the model is a local path, or already in the Hugging Face cache"""
+        import os
+
+        if os.path.isdir(repo_id):
+            return "local"
+        try:
+            from huggingface_hub import try_to_load_from_cache
+        except ImportError:
+            return "unknown"
+        return "hit" if isinstance(try_to_load_from_cache(repo_id, filename), str) else "miss"
+
+    def get_startup_report(self):
+        """Cold-start phase timings recorded while this instance was created"""
+        return self.startup_report
+
     def generate_image(self, prompt: str, negative_prompt: str = "blurry, low quality"):
         """Generate a single image from prompt"""
         print(f"Generating image for: '{prompt}'")
@@ -124,6 +199,122 @@ class SimpleSD:
 
         return response_data
 
+    def generate_images(
+        self,
+        prompts: list,
+        negative_prompts=None,
+        num_images_per_prompt: int = 1,
+        seeds=None,
+        num_inference_steps: int = 20,
+        guidance_scale: float = 7.5,
+        width: int = 512,
+        height: int = 512,
+        max_batch_size=None,
+    ):
+        """
+        Generate images for many prompts in batched pipeline calls.
+
+        Each image gets its own generator, seeded with
+        `seeds[i] * num_images_per_prompt + j` for the j-th image of prompt i.
+        Distinct prompt seeds never share image seeds, and results do not
+        depend on how images are batched. Each image reports its own seed. Without `max_batch_size`, the batch size is estimated from
+        free VRAM. A batch that runs out of memory is retried at half the size.
+        All images are returned as PNG bytes in one response.
+        """
+        import gc
+        import io
+        import random
+        import time
+        import torch
+
+        if negative_prompts is None:
+            negative_prompts = "blurry, low quality"
+        if isinstance(negative_prompts, str):
+            negative_prompts = [negative_prompts] * len(prompts)
+        if seeds is None:
+            seeds = [random.randrange(2**31) for _ in prompts]
+        if len(negative_prompts) != len(prompts) or len(seeds) != len(prompts):
+            raise ValueError("negative_prompts and seeds must have one entry per prompt")
+
+        jobs = [
+            (prompt, negative_prompt, seed * num_images_per_prompt + j)
+            for prompt, negative_prompt, seed in zip(prompts, negative_prompts, seeds)
+            for j in range(num_images_per_prompt)
+        ]
+        batch_size = max_batch_size or self._auto_batch_size(width, height)
+        batch_size = max(1, min(batch_size, len(jobs)))
+        print(f"Generating {len(jobs)} images in batches of up to {batch_size}")
+
+        started = time.perf_counter()
+        images, oom_retries, position = [], 0, 0
+        while position < len(jobs):
+            batch = jobs[position:position + batch_size]
+            try:
+                output = self.pipe(
+                    prompt=[prompt for prompt, _, _ in batch],
+                    negative_prompt=[negative_prompt for _, negative_prompt, _ in batch],
+                    generator=[torch.Generator(device=self.pipe.device).manual_seed(seed) for _, _, seed in batch],
+                    num_inference_steps=num_inference_steps,
+                    guidance_scale=guidance_scale,
+                    width=width,
+                    height=height,
+                )
+            except torch.cuda.OutOfMemoryError:
+                if batch_size == 1:
+                    raise
+                output = None
+
+            if output is None:
+                # The failed batch's activations are only released once the exception is gone;
+                # free them, then retry the same images at half the batch size
+                gc.collect()
+                torch.cuda.empty_cache()
+                batch_size //= 2
+                oom_retries += 1
+                print(f"Out of memory, retrying with batches of {batch_size}")
+                continue
+
+            for (prompt, negative_prompt, seed), image in zip(batch, output.images):
+                img_bytes = io.BytesIO()
+                image.save(img_bytes, format="PNG")
+                images.append({
+                    "prompt": prompt,
+                    "negative_prompt": negative_prompt,
+                    "seed": seed,
+                    "image_bytes": img_bytes.getvalue(),
+                    "image_size": img_bytes.tell(),
+                })
+            position += len(batch)
+
+        total_time_s = time.perf_counter() - started
+        print(f"Generated {len(images)} images in {total_time_s:.1f}s")
+
+        return {
+            "images": images,
+            "generation_params": {
+                "num_inference_steps": num_inference_steps,
+                "guidance_scale": guidance_scale,
+                "width": width,
+                "height": height,
+            },
+            "batch_size": batch_size,
+            "oom_retries": oom_retries,
+            "total_time_s": total_time_s,
+            "seconds_per_image": total_time_s / len(images) if images else 0.0,
+        }
+
+    def _auto_batch_size(self, width: int, height: int, max_batch_size: int = 16):
+        """Estimate how many images fit in free VRAM at once"""
+        import torch
+
+        if not torch.cuda.is_available():
+            return 1
+        free_bytes, _ = torch.cuda.mem_get_info()
+        # About 0.75 GB of fp16 activations per 512x512 image with classifier-free guidance,
+        # growing with pixel count; keep a fifth of free memory as headroom
+        per_image_bytes = 0.75 * 1024**3 * (width * height) / (512 * 512)
+        return max(1, min(max_batch_size, int(free_bytes * 0.8 // per_image_bytes)))
+
 
 async def main():
     print("Testing Stable Diffusion with Simple Prompt")
@@ -158,6 +349,23 @@ async def main():
     print(f"   Saved locally to: {local_image_path}")
     print(f"   File size: {result['image_size']:,} bytes")
 
+    # Batched generation: several prompts and images per prompt in one call
+    print("\nGenerating a batch of images...")
+    batch = await sd.generate_images(
+        [
+            "A lighthouse on a cliff at dawn, oil painting",
+            "A cozy reading nook with a sleeping cat, watercolor",
+        ],
+        num_images_per_prompt=2,
+        seeds=[42, 7],
+    )
+    for index, image in enumerate(batch["images"]):
+        local_image_path = os.path.join(local_dir, f"sd_batch_{result['timestamp']}_{index}.png")
+        with open(local_image_path, "wb") as f:
+            f.write(image["image_bytes"])
+        print(f"   Seed {image['seed']}: '{image['prompt']}' -> {local_image_path}")
+    print(f"   {batch['seconds_per_image']:.2f}s per image in batches of {batch['batch_size']}")
+
     print("\n" + "=" * 50)
     print("🎉 IMAGE GENERATION COMPLETED!")
     print("🖼️  Image saved locally with timestamp!")
@@ -0,0 +1,262 @@
+# # A Fake OpenAI-Compatible Server for the instructor Example
+
+# `instructor_structured_output.py` sends item descriptions to an OpenAI-compatible
+# vLLM endpoint. This module serves `/v1/chat/completions` locally with a fixed
+# per-request latency and a concurrency limit like the GPU endpoint's
+# MAX_CONCURRENCY. Replies are deterministic ItemMetadata records parsed from
+# "name, sku, price" item strings, returned as a tool call or as JSON content.
+# Packed requests (numbered item lines) get an {"items": [...]} reply, and
+# `--drop-rate` makes the server leave items out so packs fail their count check.
+# `--invalid-rate` makes some unconstrained replies fail ItemMetadata validation,
+# while requests with a `json_schema` response format always get a valid record,
+# as they would from vLLM's guided decoding.
+
+# Running it compares serial classification with the pooled, concurrent path,
+# or with --packed, concurrent with packed classification. With --dedupe, it
+# sends a feed full of repeated items twice through the extraction cache. With
+# --guided, it compares instructor's re-asking with schema-guided decoding. With
+# --stream, it shows how soon the first result arrives from `stream_items`:
+#     python fake_openai_server.py --items 20 --latency 0.2 --max-concurrency 5
+#     python fake_openai_server.py --packed --items 500 --drop-rate 0.02
+#     python fake_openai_server.py --dedupe --items 2000
+#     python fake_openai_server.py --guided --items 200 --invalid-rate 0.2
+#     python fake_openai_server.py --stream --items 100
+
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def extract_metadata(item: str):
+    """Parse an item string like "NVIDIA B200, dcxdw, 50 euros" into ItemMetadata fields"""
+    parts = [part.strip() for part in item.split(",")]
+    price = re.search(r"\d+", parts[-1] if parts else "")
+    return {
+        "item_name": parts[0] if parts else item,
+        "item_sku": parts[1] if len(parts) > 2 else "",
+        "item_price": int(price.group()) if price else 0,
+        "item_price_unit": "EUR" if re.search(r"euro|€", item, re.IGNORECASE) else "USD",
+    }
+
+
+class FakeChatCompletionsHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests, like the real endpoint
+    protocol_version = "HTTP/1.1"
+    latency_s = 0.2
+    per_item_s = 0.01
+    drop_rate = 0.0
+    invalid_rate = 0.0
+    rng = random.Random(0)
+    slots = threading.Semaphore(5)
+    requests = 0
+    connections = 0
+    counter_lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with self.counter_lock:
+            type(self).connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.counter_lock:
+            type(self).requests += 1
+
+        # Re-asks append messages after the user's request, so read the first user message
+        content = next(m["content"] for m in body["messages"] if m["role"] == "user")
+        packed = re.findall(r"^\d+\. (.*)$", content, re.MULTILINE)
+        items = packed or [content.rsplit("\n", 1)[-1].strip()]
+
+        # Requests beyond the concurrency limit queue, as they do on the GPU worker
+        with self.slots:
+            time.sleep(self.latency_s + self.per_item_s * len(items))
+
+        if packed:
+            records = [extract_metadata(item) for item in items if self.rng.random() >= self.drop_rate]
+            metadata = json.dumps({"items": records})
+        else:
+            record = extract_metadata(items[0])
+            guided = (body.get("response_format") or {}).get("type") == "json_schema"
+            if not guided and self.rng.random() < self.invalid_rate:
+                # The kind of slip a small model makes without constrained decoding
+                record["item_price"] = f"{record['item_price']} {record['item_price_unit'].lower()}"
+            metadata = json.dumps(record)
+        message = {"role": "assistant", "content": metadata}
+        if body.get("tools"):
+            name = body["tools"][0]["function"]["name"]
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{self.requests}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": metadata},
+                }],
+            }
+
+        payload = json.dumps({
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if body.get("tools") else "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(latency_s: float = 0.2, max_concurrency: int = 5, port: int = 0, per_item_s: float = 0.01,
+                 drop_rate: float = 0.0, invalid_rate: float = 0.0):
+    """Serve in a background thread; returns (server, base_url)"""
+    handler = type("Handler", (FakeChatCompletionsHandler,), {
+        "latency_s": latency_s,
+        "per_item_s": per_item_s,
+        "drop_rate": drop_rate,
+        "invalid_rate": invalid_rate,
+        "rng": random.Random(0),
+        "slots": threading.Semaphore(max_concurrency),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1"
+
+
+def repeat_feed(count: int, distinct: int, seed: int = 0):
+    """A product feed where each description recurs with case and whitespace changes"""
+    rng = random.Random(seed)
+    feed = []
+    for _ in range(count):
+        i = rng.randrange(distinct)
+        item = f"Item {i}, sku{i:04d}, ${10 + i}"
+        feed.append(rng.choice([item, item.upper(), item.lower(), f"  {item} ", item.replace(", ", " ,  ")]))
+    return feed
+
+
+def run_dedupe(client_class, model_name, server, base_url, args):
+    """Classify the same kind of feed twice; the second run is answered from the cache"""
+    cache_path = os.path.join(tempfile.mkdtemp(), "item_metadata_cache.sqlite3")
+    for run in (1, 2):
+        client = client_class(cache_path=cache_path, model_name=model_name)
+        requests_before = server.RequestHandlerClass.requests
+        start = time.perf_counter()
+        results = client.classify_items_packed(base_url, "fake", repeat_feed(args.items, args.items // 10, run),
+                                               args.max_concurrency)
+        seconds = time.perf_counter() - start
+        errors = sum(1 for result in results if "error" in result)
+        print(f"   Run {run}: {seconds:.2f}s, {server.RequestHandlerClass.requests - requests_before} requests, "
+              f"{client.dedupe_stats['hit_rate']:.1%} hit rate, {errors} errors\n")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare classification paths against a fake server")
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per request on the server")
+    parser.add_argument("--per-item", type=float, default=0.01, help="Extra seconds per item in a request")
+    parser.add_argument("--max-concurrency", type=int, default=5)
+    parser.add_argument("--packed", action="store_true", help="Compare concurrent with packed classification")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="Chance the server leaves an item out of a packed reply")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Send a feed with repeated items twice through the extraction cache")
+    parser.add_argument("--guided", action="store_true",
+                        help="Compare instructor re-asking with schema-guided decoding")
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="Chance an unconstrained reply fails validation")
+    parser.add_argument("--stream", action="store_true",
+                        help="Compare waiting for a whole batch with streaming results")
+    args = parser.parse_args()
+
+    os.environ.setdefault("RUNPOD_API_KEY", "fake")
+    from instructor_structured_output import MODEL_NAME, ItemMetadataClient
+
+    server, base_url = start_server(args.latency, args.max_concurrency, per_item_s=args.per_item,
+                                    drop_rate=args.drop_rate, invalid_rate=args.invalid_rate)
+    items = [f"Item {i}, sku{i:04d}, ${10 + i}" for i in range(args.items)]
+    if args.dedupe:
+        run_dedupe(ItemMetadataClient, MODEL_NAME, server, base_url, args)
+        return
+    client = ItemMetadataClient(model_name=MODEL_NAME)
+
+    def serial():
+        return [
+            {"item": item, "metadata": client.request_item_classification(item, base_url, "fake").model_dump(mode="json")}
+            for item in items
+        ]
+
+    def concurrent():
+        return client.classify_items_concurrent(base_url, "fake", items, args.max_concurrency)
+
+    def packed():
+        return client.classify_items_packed(base_url, "fake", items, args.max_concurrency)
+
+    def guided():
+        return client.classify_items_concurrent(base_url, "fake", items, args.max_concurrency, guided=True)
+
+    first_result = {}
+
+    def streamed():
+        async def consume():
+            start = time.perf_counter()
+            results = [None] * len(items)
+            async for result in client.stream_items(base_url, "fake", items, args.max_concurrency):
+                first_result.setdefault("Streamed", time.perf_counter() - start)
+                results[result.pop("index")] = result
+            return results
+
+        return asyncio.run(consume())
+
+    if args.guided:
+        runs = [("Reask", concurrent), ("Guided", guided)]
+    elif args.stream:
+        runs = [("Concurrent", concurrent), ("Streamed", streamed)]
+    elif args.packed:
+        runs = [("Concurrent", concurrent), ("Packed", packed)]
+    else:
+        runs = [("Serial", serial), ("Concurrent", concurrent)]
+    timings, outputs = [], []
+    for label, run in runs:
+        print(f"🚀 {label}: {args.items} items")
+        requests_before = server.RequestHandlerClass.requests
+        start = time.perf_counter()
+        outputs.append(run())
+        first_result.setdefault(label, time.perf_counter() - start)
+        timings.append((label, time.perf_counter() - start, server.RequestHandlerClass.requests - requests_before,
+                        sum(1 for result in outputs[-1] if "error" in result)))
+
+    # Re-asking can run out of attempts; every other item must match
+    for first, second in zip(*outputs):
+        assert "error" in first or "error" in second or first == second, "Both paths should extract the same records"
+    print()
+    for label, seconds, requests, errors in timings:
+        print(f"   {label + ':':<12}{seconds:.2f}s ({args.items / seconds:.1f} items/s, {requests} requests, "
+              f"{errors} errors, first result after {first_result[label]:.2f}s)")
+    print(f"   Speedup:    {timings[0][1] / timings[1][1]:.1f}x")
+    print(f"   Server saw {server.RequestHandlerClass.requests} requests "
+          f"on {server.RequestHandlerClass.connections} connections")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# # Fake vLLM Engine for Local Runs
+
+# A deterministic, CPU-only stand-in for the parts of the vLLM API that the
+# examples in this folder use: `LLM.generate`, `SamplingParams` and the
+# step-by-step `llm_engine` interface used for token streaming.
+# `install()` registers it as the `vllm` module, so `MinimalVLLM` can run
+# unchanged in-process without a GPU.
+
+# Every engine step emits one token for each running request and sleeps for
+# `step_latency_s`; `LLM.generate` additionally pays `call_overhead_s` once,
+# like the fixed cost of a remote round trip.
+
+# Run this file to stream a few prompts through MinimalVLLM locally:
+#     python fake_vllm.py
+
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
+import sys
+import time
+import types
+
+WORDS = (
+    "the model runs fast on small batches and large ones alike while tokens "
+    "stream back to the client as soon as each decoding step finishes"
+).split()
+
+
+class SamplingParams:
+    def __init__(
+        self,
+        temperature=1.0,
+        top_p=1.0,
+        max_tokens=16,
+        stop=None,
+        seed=None,
+        n=1,
+        **kwargs,
+    ):
+        self.temperature = temperature
+        self.top_p = top_p
+        self.max_tokens = max_tokens
+        self.stop = [stop] if isinstance(stop, str) else list(stop or [])
+        self.seed = seed
+        self.n = n
+
+
+class CompletionOutput:
+    def __init__(self, index, text, token_ids, finish_reason):
+        self.index = index
+        self.text = text
+        self.token_ids = token_ids
+        self.finish_reason = finish_reason
+
+
+class RequestOutput:
+    def __init__(self, request_id, prompt, prompt_token_ids, outputs, finished):
+        self.request_id = request_id
+        self.prompt = prompt
+        self.prompt_token_ids = prompt_token_ids
+        self.outputs = outputs
+        self.finished = finished
+
+
+class _Request:
+    def __init__(self, request_id, prompt, params):
+        self.request_id = request_id
+        self.prompt = prompt
+        self.params = params
+        self.prompt_token_ids = [_token_id(word) for word in prompt.split()]
+        self.token_ids = []
+        self.text = ""
+        self.finish_reason = None
+
+        # The sampled continuation depends only on the prompt and sampling settings
+        key = f"{prompt}|{params.temperature}|{params.top_p}|{params.seed}"
+        self._offset = int(hashlib.sha256(key.encode("utf-8")).hexdigest(), 16)
+
+    def decode_next(self):
+        word = WORDS[(self._offset + len(self.token_ids)) % len(WORDS)]
+        self.token_ids.append(_token_id(word))
+        self.text += word if not self.text else f" {word}"
+
+        for stop in self.params.stop:
+            if stop in self.text:
+                self.text = self.text[: self.text.index(stop)]
+                self.finish_reason = "stop"
+                return
+        if len(self.token_ids) >= self.params.max_tokens:
+            self.finish_reason = "length"
+
+    def output(self):
+        completion = CompletionOutput(0, self.text, list(self.token_ids), self.finish_reason)
+        return RequestOutput(
+            self.request_id,
+            self.prompt,
+            self.prompt_token_ids,
+            [completion],
+            self.finish_reason is not None,
+        )
+
+
+class LLMEngine:
+    """Continuous-batching engine: each step decodes one token per running request."""
+
+    def __init__(self, step_latency_s=0.01):
+        self.step_latency_s = step_latency_s
+        self._requests = {}
+
+    def add_request(self, request_id, prompt, params, **kwargs):
+        self._requests[request_id] = _Request(request_id, prompt, params)
+
+    def abort_request(self, request_ids):
+        if isinstance(request_ids, str):
+            request_ids = [request_ids]
+        for request_id in request_ids:
+            self._requests.pop(request_id, None)
+
+    def has_unfinished_requests(self):
+        return bool(self._requests)
+
+    def step(self):
+        if not self._requests:
+            return []
+        time.sleep(self.step_latency_s)
+
+        outputs = []
+        for request_id, request in list(self._requests.items()):
+            request.decode_next()
+            outputs.append(request.output())
+            if request.finish_reason is not None:
+                del self._requests[request_id]
+        return outputs
+
+
+class LLM:
+    def __init__(self, model="fake", step_latency_s=0.01, call_overhead_s=0.0, **kwargs):
+        self.model = model
+        self.call_overhead_s = call_overhead_s
+        self.llm_engine = LLMEngine(step_latency_s)
+        self._counter = 0
+
+    def generate(self, prompts, sampling_params=None, **kwargs):
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        if not isinstance(sampling_params, (list, tuple)):
+            sampling_params = [sampling_params or SamplingParams()] * len(prompts)
+        time.sleep(self.call_overhead_s)
+
+        request_ids = []
+        for prompt, params in zip(prompts, sampling_params):
+            self._counter += 1
+            request_ids.append(f"generate-{self._counter}")
+            self.llm_engine.add_request(request_ids[-1], prompt, params)
+
+        finished = {}
+        while len(finished) < len(request_ids):
+            for output in self.llm_engine.step():
+                if output.finished:
+                    finished[output.request_id] = output
+        return [finished[request_id] for request_id in request_ids]
+
+
+def install(step_latency_s=0.01, call_overhead_s=0.0):
+    """Register this module as `vllm` so `from vllm import LLM` returns the fake."""
+
+    class ConfiguredLLM(LLM):
+        def __init__(self, model="fake", **kwargs):
+            super().__init__(model, step_latency_s, call_overhead_s, **kwargs)
+
+    module = types.ModuleType("vllm")
+    module.LLM = ConfiguredLLM
+    module.SamplingParams = SamplingParams
+    sys.modules["vllm"] = module
+    return module
+
+
+class LocalWorker:
+    """
+    Async, remote-style proxy around an in-process instance.
+
+    Methods become awaitables that run one at a time on a single thread, like
+    calls to a remote endpoint with one worker. Use it to exercise client code
+    written against an @remote class without deploying it.
+    """
+
+    def __init__(self, instance):
+        self._instance = instance
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.calls = 0
+
+    def __getattr__(self, name):
+        method = getattr(self._instance, name)
+
+        async def call(*args, **kwargs):
+            self.calls += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, lambda: method(*args, **kwargs))
+
+        return call
+
+
+def _token_id(word):
+    return int(hashlib.sha256(word.encode("utf-8")).hexdigest()[:4], 16)
+
+
+async def main():
+    install(step_latency_s=0.02)
+    from vllm_inference import MinimalVLLM
+
+    # The @remote wrapper keeps the undecorated class, which runs in-process
+    llm = MinimalVLLM()._class_type()
+
+    print("🌊 Streaming two prompts from the fake engine:")
+    async for event in llm.stream_batch(["Hello, my name is", "The capital of France is"]):
+        if event["finished"]:
+            print(f"\n   [{event['index']}] done: {event['tokens']} tokens, "
+                  f"TTFT {event['ttft_s'] * 1000:.0f}ms, "
+                  f"ITL {event['mean_itl_s'] * 1000:.0f}ms, {event['finish_reason']}")
+        else:
+            print(f"   [{event['index']}] +{event['delta']!r}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -16,6 +16,19 @@
 # We will use Qwen3-0.6B, beacause it's a compact model that's efficient for structured data extraction tasks
 # When we configure our endpoint, we specify multiple GPU types to improve availability and reduce cold start times
 
+# The GPU endpoint serves MAX_CONCURRENCY requests at once, so the client can also classify items concurrently
+# over one pooled, keep-alive connection pool (`classify_items_concurrent`). To try it without a GPU, run
+# `python fake_openai_server.py`, which serves a fake OpenAI-compatible endpoint locally.
+# For large catalogs, `classify_items_packed` sends many items per request and splits packs that fail.
+# Both paths skip repeated items, and with `cache_path` set they reuse earlier extractions from a SQLite cache.
+# With `guided=True`, the schema is sent as a response format so vLLM only generates valid records.
+
+# Extraction is pure I/O, so by default `main()` skips the CPU endpoint: it runs the same client class in
+# this process and streams results as they finish (`stream_items`). Pass `--via-cpu-worker` to keep the hop.
+# `ItemMetadataClient` is a plain class that can be imported and used directly; `RemoteCPUClient` is the
+# same class deployed on the CPU endpoint.
+
+import argparse
 import asyncio
 import os
 from tetra_rp import remote, ServerlessEndpoint, GpuGroup, LiveServerless, CpuInstanceType
@@ -51,25 +64,47 @@ def init_endpoint():
 
 
 # Client code that will interact with the GPU server and submit unstructed text in the form of requests.
-@remote(resource_config=cpu_live_serverless, dependencies=["openai", "instructor"])
-class RemoteCPUClient: 
-    def __init__(self):
+class ItemMetadataClient:
+    EXAMPLE_ITEMS = [
+        "50ft ethernet cable, 43ej4, $10",
+        "NVIDIA 4090 GPU, f4fodw, 200 dollars",
+        "NVIDIA B200, dcxdw, 50 euros",
+    ]
+
+    def __init__(self, cache_path=None, model_name=None):
+        import contextvars
+        import os
+
+        # The CPU endpoint sets MODEL_NAME; in-process runs pass the model explicitly
+        self.model_name = model_name or os.environ["MODEL_NAME"]
+
+        # The schema and clients are created once and reused for every item,
+        # so connections to the GPU server stay open between requests
+        self.item_metadata = self._item_metadata_schema()
+        self.item_metadata_list = self._item_metadata_list_schema(self.item_metadata)
+        self.clients = {}
+        self.openai_clients = {}
+        self.async_clients = {}
+        self.loop = None
+
+        # Round trips per item, recorded by HTTP hooks on the async client
+        self.round_trips = contextvars.ContextVar("round_trips", default=None)
+        self.retry_stats = {}
+
+        # Packed extraction: the pack size adapts to how often packs fail
+        self.pack_size = 8.0
+        self.pack_stats = {"requests": 0, "failed_packs": 0, "items": 0, "errors": 0}
+
+        # With a cache_path, extracted records are cached by normalized text, model and schema;
+        # by default repeated items are only deduped within a call
+        self.cache = self._open_cache(cache_path)
+        self.dedupe_stats = {}
         print("initialized!")
 
-    def request_item_classification(self, item: str, gpu_server_url: str, api_key: str):
-        import instructor
-        from openai import OpenAI
+    @staticmethod
+    def _item_metadata_schema():
         from enum import Enum
         from pydantic import BaseModel, Field
-        import os
-        # Here, we make requests to the serverless GPU endpoint that we previously created
-
-        # We create an instructor client that will make the requests; the vllm-based docker image
-        # we used when creating this endpoint comes with out of the box openai-compatible routes
-        print("attemping to make a request to url: ")
-        client = instructor.from_openai(
-            OpenAI(api_key=api_key, base_url=gpu_server_url),
-        )
 
         # define classes with Pydantic that our deployed model will parse unstructed data into
         class CurrencyUnit(str, Enum):
@@ -85,40 +120,492 @@ class RemoteCPUClient:
                 description="Unit of currency (eg USD) for the provided item price"
             )
 
+        return ItemMetadata
+
+    @staticmethod
+    def _item_metadata_list_schema(item_metadata):
+        from typing import List
+        from pydantic import BaseModel, Field
+
+        class ItemMetadataList(BaseModel):
+            items: List[item_metadata] = Field(description="Metadata for each item, in the order given")
+
+        return ItemMetadataList
+
+    @staticmethod
+    def _packed_messages(items: list):
+        lines = "\n".join(f"{i}. {item}" for i, item in enumerate(items, start=1))
+        return [{
+            "role": "user",
+            "content": f"Extract metadata from each of these {len(items)} examples, in order, "
+                       f"one record per example:\n{lines}",
+        }]
+
+    @staticmethod
+    def _messages(item: str):
+        return [{"role": "user", "content": f"Extract metadata from this example:\n {item}"}]
+
+    @staticmethod
+    def _normalize(item: str):
+        """Fold the case and whitespace differences that repeat feeds are full of"""
+        import re
+        import unicodedata
+
+        text = " ".join(unicodedata.normalize("NFKC", item).split())
+        return re.sub(r" ([,.;:!?)])", r"\1", text).casefold()
+
+    def _open_cache(self, cache_path):
+        import hashlib
+        import json
+        import sqlite3
+
+        schema = json.dumps(self.item_metadata.model_json_schema(), sort_keys=True)
+        self.schema_hash = hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+        if not cache_path:
+            return None
+
+        cache = sqlite3.connect(cache_path, check_same_thread=False)
+        cache.execute(
+            "CREATE TABLE IF NOT EXISTS item_metadata ("
+            "normalized TEXT, model TEXT, schema_hash TEXT, metadata TEXT, "
+            "PRIMARY KEY (normalized, model, schema_hash))"
+        )
+        # Records extracted with an older ItemMetadata schema can never be hit again
+        cache.execute("DELETE FROM item_metadata WHERE schema_hash != ?", (self.schema_hash,))
+        cache.commit()
+        return cache
+
+    def _cache_lookup(self, keys: list, model: str):
+        import json
+
+        found = {}
+        if self.cache is None:
+            return found
+        # Stay under SQLite's limit on query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self.cache.execute(
+                f"SELECT normalized, metadata FROM item_metadata WHERE model = ? AND schema_hash = ? "
+                f"AND normalized IN ({', '.join('?' * len(chunk))})",
+                [model, self.schema_hash, *chunk],
+            )
+            found.update((key, json.loads(metadata)) for key, metadata in rows)
+        return found
+
+    def _cache_store(self, records: dict, model: str):
+        import json
+
+        if self.cache is None or not records:
+            return
+        with self.cache:
+            self.cache.executemany(
+                "INSERT OR REPLACE INTO item_metadata VALUES (?, ?, ?, ?)",
+                [(key, model, self.schema_hash, json.dumps(metadata)) for key, metadata in records.items()],
+            )
+
+    def _classify_deduped(self, items: list, classify):
+        """
+        Send each distinct, uncached item through `classify` once.
+
+        Items are matched on their normalized text. Successful extractions are
+        stored in the cache; errors are not, so they are retried next time.
+        """
+
+        model = self.model_name
+        keys = [self._normalize(item) for item in items]
+        first_seen = {}
+        for key, item in zip(keys, items):
+            first_seen.setdefault(key, item)
+
+        cached = self._cache_lookup(list(first_seen), model)
+        misses = [key for key in first_seen if key not in cached]
+        extracted = dict(zip(misses, classify([first_seen[key] for key in misses]))) if misses else {}
+        self._cache_store({key: r["metadata"] for key, r in extracted.items() if "metadata" in r}, model)
+
+        self.dedupe_stats = {
+            "items": len(items),
+            "unique": len(first_seen),
+            "cache_hits": len(cached),
+            "extracted": len(misses),
+            # Share of items answered without a request to the GPU endpoint
+            "hit_rate": 1 - len(misses) / len(items) if items else 0.0,
+        }
+        print(f"Dedupe: {len(items)} items, {len(first_seen)} unique, {len(cached)} cached, "
+              f"{len(misses)} extracted ({self.dedupe_stats['hit_rate']:.0%} hit rate)")
+
+        return [
+            {"item": item, "metadata": cached[key]} if key in cached else {**extracted[key], "item": item}
+            for key, item in zip(keys, items)
+        ]
+
+    def _client(self, gpu_server_url: str, api_key: str):
+        import instructor
+        from openai import OpenAI
+
+        # We create an instructor client that will make the requests; the vllm-based docker image
+        # we used when creating this endpoint comes with out of the box openai-compatible routes
+        key = (gpu_server_url, api_key)
+        if key not in self.clients:
+            self.clients[key] = instructor.from_openai(OpenAI(api_key=api_key, base_url=gpu_server_url))
+        return self.clients[key]
+
+    def _async_openai(self, gpu_server_url: str, api_key: str):
+        import time
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        async def on_request(request):
+            record = self.round_trips.get()
+            if record is not None:
+                record["started"] = time.perf_counter()
+
+        async def on_response(response):
+            record = self.round_trips.get()
+            if record is not None:
+                # The SDK retries 429s and 5xx errors on its own; only answered requests are extraction attempts
+                if response.status_code < 400:
+                    record["seconds"].append(time.perf_counter() - record["started"])
+                else:
+                    record["transport_errors"] += 1
+
+        key = (gpu_server_url, api_key)
+        if key not in self.openai_clients:
+            self.openai_clients[key] = AsyncOpenAI(
+                api_key=api_key,
+                base_url=gpu_server_url,
+                http_client=DefaultAsyncHttpxClient(event_hooks={"request": [on_request], "response": [on_response]}),
+            )
+        return self.openai_clients[key]
+
+    def _async_client(self, gpu_server_url: str, api_key: str):
+        import instructor
+
+        key = (gpu_server_url, api_key)
+        if key not in self.async_clients:
+            self.async_clients[key] = instructor.from_openai(self._async_openai(gpu_server_url, api_key))
+        return self.async_clients[key]
+
+    def _ensure_loop(self):
+        import asyncio
+        import threading
+
+        # Pooled async connections belong to the loop that opened them, so keep one loop alive
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        return self.loop
+
+    def _run(self, coro):
+        """Run a coroutine on this client's own event loop, which outlives single calls"""
+        import asyncio
+
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def request_item_classification(self, item: str, gpu_server_url: str, api_key: str):
+        # Here, we make requests to the serverless GPU endpoint that we previously created
+        print("attemping to make a request to url: ")
+        client = self._client(gpu_server_url, api_key)
+
         # An instructor client will generate outputs with an API similar to regular chat completions,
         # but if we pass it our Pydantic model, it will parse the passed unstructured text object
         # into the provided model.
         resp = client.chat.completions.create(
-            response_model=ItemMetadata,
-            model=os.environ["MODEL_NAME"],
-            messages=[
-                {"role": "user", "content": f"Extract metadata from this example:\n {item}"}
-            ],
+            response_model=self.item_metadata,
+            model=self.model_name,
+            messages=self._messages(item),
         )
         return resp
 
     def classify_items(self, gpu_server_url: str, RUNPOD_API_KEY: str):
-        items = [
-            "50ft ethernet cable, 43ej4, $10",
-            "NVIDIA 4090 GPU, f4fodw, 200 dollars",
-            "NVIDIA B200, dcxdw, 50 euros",
-        ]
-
         # Doing these serially is not the most efficient, but it works fine for our purposes once the worker is warm
-        for item in items:
+        for item in self.EXAMPLE_ITEMS:
             print(self.request_item_classification(item, gpu_server_url, RUNPOD_API_KEY))
 
+    def classify_items_concurrent(self, gpu_server_url: str, RUNPOD_API_KEY: str, items=None, max_concurrency=5,
+                                  guided=False, max_retries=3):
+        """
+        Classify items with up to `max_concurrency` requests in flight.
+
+        Match `max_concurrency` to the GPU endpoint's MAX_CONCURRENCY. Repeated
+        and cached items are not sent. Returns one {"item", "metadata"} or
+        {"item", "error"} dict per item, in order.
+
+        By default instructor re-asks the model, up to `max_retries` attempts,
+        when a reply fails validation. With `guided=True` the ItemMetadata JSON
+        schema is sent as a `json_schema` response format instead. vLLM then
+        constrains decoding to the schema, so the first reply is valid.
+        Retries and the time they took are reported in `retry_stats`. Requests
+        the OpenAI SDK resent after 429 or 5xx errors are not validation
+        retries; they are counted apart, as `transport_retries`.
+        """
+        items = items or self.EXAMPLE_ITEMS
+        self.retry_stats = {}
+        results = self._classify_deduped(items, lambda unique: self._run(
+            self._classify_items_async(unique, gpu_server_url, RUNPOD_API_KEY, max_concurrency, guided, max_retries)
+        ))
+        print(f"Classified {len(items)} items, {max_concurrency} at a time")
+        if self.retry_stats:
+            print(f"Retries ({self.retry_stats['mode']}): {self.retry_stats['retries']} in "
+                  f"{self.retry_stats['round_trips']} round trips, {self.retry_stats['retry_rate']:.0%} of items, "
+                  f"{self.retry_stats['retry_latency_s']:.2f}s, "
+                  f"{self.retry_stats['transport_retries']} transport retries")
+        return results
+
+    async def _classify_items_async(self, items, gpu_server_url: str, api_key: str, max_concurrency: int,
+                                    guided: bool = False, max_retries: int = 3):
+        import asyncio
+
+        client = self._async_client(gpu_server_url, api_key)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        round_trips = []
+
+        async def classify(item):
+            async with semaphore:
+                result, record = await self._classify_one(client, item, guided, max_retries)
+            round_trips.append(record)
+            return result
+
+        results = await asyncio.gather(*(classify(item) for item in items))
+        self.retry_stats = self._retry_stats(guided, round_trips)
+        return results
+
+    async def _classify_one(self, client, item: str, guided: bool, max_retries: int):
+        """Classify one item; returns its result and a record of the round trips it took"""
+
+        # Each item runs in its own task, so the hooks see only this item's requests
+        record = {"started": None, "seconds": [], "transport_errors": 0}
+        self.round_trips.set(record)
+        try:
+            if guided:
+                resp = await self._create_guided(client.client, item, max_retries)
+            else:
+                resp = await client.chat.completions.create(
+                    response_model=self.item_metadata,
+                    model=self.model_name,
+                    messages=self._messages(item),
+                    max_retries=max_retries,
+                )
+        except Exception as e:
+            return {"item": item, "error": str(e)}, record
+        return {"item": item, "metadata": resp.model_dump(mode="json")}, record
+
+    @staticmethod
+    def _retry_stats(guided: bool, records: list):
+        # Validation retries only; requests the SDK retried after HTTP errors are counted apart
+        attempts = [record["seconds"] for record in records]
+        return {
+            "mode": "guided" if guided else "reask",
+            "items": len(attempts),
+            "round_trips": sum(len(seconds) for seconds in attempts),
+            "retries": sum(max(0, len(seconds) - 1) for seconds in attempts),
+            "retry_rate": sum(1 for seconds in attempts if len(seconds) > 1) / len(attempts) if attempts else 0.0,
+            "retry_latency_s": sum(sum(seconds[1:]) for seconds in attempts),
+            "transport_retries": sum(record["transport_errors"] for record in records),
+        }
+
+    async def stream_items(self, gpu_server_url: str, RUNPOD_API_KEY: str, items=None, max_concurrency=5,
+                           guided=False, max_retries=3):
+        """
+        Classify items in this process and yield each result as soon as it is ready.
+
+        This is the direct path: the caller talks to the OpenAI-compatible URL
+        itself, without the CPU worker in between. Results arrive in completion
+        order as {"index", "item", "metadata"} or {"index", "item", "error"}
+        dicts. Cached and repeated items are handled as in
+        classify_items_concurrent. As an async generator, it only works
+        in-process, on `ItemMetadataClient(model_name=...)`.
+        """
+        import asyncio
+
+        items = items or self.EXAMPLE_ITEMS
+        model = self.model_name
+        positions = {}
+        for index, item in enumerate(items):
+            positions.setdefault(self._normalize(item), []).append(index)
+
+        cached = self._cache_lookup(list(positions), model)
+        misses = [key for key in positions if key not in cached]
+        self.dedupe_stats = {
+            "items": len(items),
+            "unique": len(positions),
+            "cache_hits": len(cached),
+            "extracted": len(misses),
+            "hit_rate": 1 - len(misses) / len(items) if items else 0.0,
+        }
+        for key, metadata in cached.items():
+            for index in positions[key]:
+                yield {"index": index, "item": items[index], "metadata": metadata}
+
+        # Requests run on this client's own loop, next to its pooled connections;
+        # the caller's loop only waits for them
+        loop = self._ensure_loop()
+        client = self._async_client(gpu_server_url, RUNPOD_API_KEY)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        round_trips = []
+
+        async def classify(key):
+            async with semaphore:
+                result, record = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(
+                    self._classify_one(client, items[positions[key][0]], guided, max_retries), loop
+                ))
+            round_trips.append(record)
+            return key, result
+
+        tasks = [asyncio.ensure_future(classify(key)) for key in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                key, result = await next_done
+                if "metadata" in result:
+                    self._cache_store({key: result["metadata"]}, model)
+                for index in positions[key]:
+                    yield {**result, "index": index, "item": items[index]}
+        finally:
+            for task in tasks:
+                task.cancel()
+        self.retry_stats = self._retry_stats(guided, round_trips)
+
+    async def _create_guided(self, openai_client, item: str, max_retries: int):
+        """Request a reply constrained to the ItemMetadata schema, and validate it"""
+        from pydantic import ValidationError
+
+        messages = self._messages(item)
+        response_format = {
+            "type": "json_schema",
+            "json_schema": {"name": "ItemMetadata", "schema": self.item_metadata.model_json_schema()},
+        }
+        for attempt in range(max_retries):
+            resp = await openai_client.chat.completions.create(
+                model=self.model_name,
+                messages=messages,
+                response_format=response_format,
+            )
+            content = resp.choices[0].message.content
+            try:
+                return self.item_metadata.model_validate_json(content)
+            except ValidationError as e:
+                # Only a server without guided decoding should get here
+                if attempt == max_retries - 1:
+                    raise
+                messages = messages + [
+                    {"role": "assistant", "content": content},
+                    {"role": "user", "content": f"Fix these validation errors:\n{e}"},
+                ]
+
+    def classify_items_packed(self, gpu_server_url: str, RUNPOD_API_KEY: str, items=None, max_concurrency=5,
+                              max_pack_size=32):
+        """
+        Classify items several at a time, with a list response model per request.
+
+        Packing spreads the per-request overhead and prompt prefill over many
+        short items. A pack that fails validation or returns the wrong number
+        of records is split in half and retried, down to single items. The
+        pack size grows by one after each good pack and halves after each
+        failed one, up to `max_pack_size`. Repeated and cached items are not
+        sent. Returns one {"item", "metadata"} or {"item", "error"} dict per
+        item, in order.
+        """
+        items = items or self.EXAMPLE_ITEMS
+        self.pack_stats = {"requests": 0, "failed_packs": 0, "items": 0, "errors": 0}
+        results = self._classify_deduped(items, lambda unique: self._run(
+            self._classify_packed_async(unique, gpu_server_url, RUNPOD_API_KEY, max_concurrency, max_pack_size)
+        ))
+        print(f"Classified {len(items)} items in {self.pack_stats['requests']} requests "
+              f"({self.pack_stats['failed_packs']} failed packs, pack size now {int(self.pack_size)})")
+        return results
+
+    async def _classify_packed_async(self, items, gpu_server_url: str, api_key: str, max_concurrency: int,
+                                     max_pack_size: int):
+        import asyncio
+
+        client = self._async_client(gpu_server_url, api_key)
+        results = [None] * len(items)
+        next_index = 0
+
+        async def worker():
+            nonlocal next_index
+            while next_index < len(items):
+                start = next_index
+                end = next_index = min(len(items), start + max(1, int(self.pack_size)))
+                results[start:end] = await self._classify_pack(client, items[start:end], max_pack_size)
+
+        await asyncio.gather(*(worker() for _ in range(max_concurrency)))
+        return results
+
+    async def _classify_pack(self, client, items: list, max_pack_size: int):
+        """Classify one pack, splitting it in half until the parts succeed"""
+
+        self.pack_stats["requests"] += 1
+        try:
+            if len(items) == 1:
+                records = [await client.chat.completions.create(
+                    response_model=self.item_metadata,
+                    model=self.model_name,
+                    messages=self._messages(items[0]),
+                )]
+            else:
+                # One attempt only: a failed pack is split rather than retried whole
+                resp = await client.chat.completions.create(
+                    response_model=self.item_metadata_list,
+                    model=self.model_name,
+                    messages=self._packed_messages(items),
+                    max_retries=1,
+                )
+                records = resp.items
+                if len(records) != len(items):
+                    raise ValueError(f"Expected {len(items)} records, got {len(records)}")
+        except Exception as e:
+            if len(items) == 1:
+                self.pack_stats["errors"] += 1
+                return [{"item": items[0], "error": str(e)}]
+            self.pack_stats["failed_packs"] += 1
+            self.pack_size = max(1.0, self.pack_size / 2)
+            middle = len(items) // 2
+            return (await self._classify_pack(client, items[:middle], max_pack_size)
+                    + await self._classify_pack(client, items[middle:], max_pack_size))
+
+        if len(items) > 1:
+            self.pack_size = min(float(max_pack_size), self.pack_size + 1)
+        self.pack_stats["items"] += len(items)
+        return [{"item": item, "metadata": record.model_dump(mode="json")} for item, record in zip(items, records)]
+
+
+# The same client, deployed on the CPU endpoint
+RemoteCPUClient = remote(
+    resource_config=cpu_live_serverless, dependencies=["openai", "instructor"]
+)(ItemMetadataClient)
+
 async def main():
+    parser = argparse.ArgumentParser(description="Structured item metadata extraction")
+    parser.add_argument("--via-cpu-worker", action="store_true",
+                        help="Run the client on the remote CPU endpoint instead of in this process")
+    parser.add_argument("--guided", action="store_true", help="Use schema-guided decoding")
+    args = parser.parse_args()
+
     # local entrypoint - await our dummy function call to generate the remote sls endpoint
-    print("creating remote endpoint and client")
+    print("creating remote endpoint")
     await init_endpoint()
-    client = RemoteCPUClient()
 
     gpu_server_url = f"https://api.runpod.ai/v2/{gpu_serverless_endpoint.id}/openai/v1"
     print("GPU server url: ", gpu_server_url)
 
-    # call our classification function that will run on a remote endpoint
-    await client.classify_items(gpu_server_url, RUNPOD_API_KEY)
+    if args.via_cpu_worker:
+        client = RemoteCPUClient(model_name=MODEL_NAME)
+
+        # call our classification function that will run on a remote endpoint
+        await client.classify_items(gpu_server_url, RUNPOD_API_KEY)
+
+        # the same items, sent concurrently up to the GPU endpoint's MAX_CONCURRENCY
+        results = await client.classify_items_concurrent(
+            gpu_server_url, RUNPOD_API_KEY, max_concurrency=5, guided=args.guided
+        )
+        for result in results:
+            print(result)
+        return
+
+    # Extraction is pure I/O, so by default the client runs right here (this needs openai and
+    # instructor installed locally) and results stream back as each request finishes
+    client = ItemMetadataClient(model_name=MODEL_NAME)
+    async for result in client.stream_items(gpu_server_url, RUNPOD_API_KEY, max_concurrency=5, guided=args.guided):
+        print(result)
 
 if __name__ == "__main__":
     asyncio.run(main())
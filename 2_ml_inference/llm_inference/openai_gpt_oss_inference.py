@@ -4,6 +4,9 @@
 # with the Tetra framework. It showcases:
 # - Model loading with Transformers pipeline
 # - Text generation from conversational messages
+# - Batched generation for many conversations, returning only the new replies
+# - Chat sessions that keep their key/value cache on the worker between turns
+#   (the caller keeps the history too, so a turn that lands on another worker rebuilds the session)
 
 import asyncio
 from tetra_rp import remote, LiveServerless, GpuGroup
@@ -22,17 +25,89 @@ gpu_config = LiveServerless(
     system_dependencies=["build-essential"]
 )
 class OpenAIGPTOSSInference:
-    def __init__(self):
-        from transformers import pipeline
+    def __init__(self, model_id="openai/gpt-oss-20b", warmup=False, session_cache_mb=4096, max_sessions=256):
+        from collections import OrderedDict
+        import time
+
+        # Cold-start phases, returned by get_startup_report()
+        started = time.perf_counter()
+        phases = {}
 
-        model_id = "openai/gpt-oss-20b"
+        from transformers import pipeline
+        phases["imports_s"] = time.perf_counter() - started
 
+        # device_map="auto" loads weights straight onto the GPU, downloading them on a cache miss
+        model_cache = self._model_cache_state(model_id, "config.json")
+        mark = time.perf_counter()
         self.pipe = pipeline(
             "text-generation",
             model=model_id,
             torch_dtype="auto",
             device_map="auto",
         )
+        phases["load_to_device_s"] = time.perf_counter() - mark
+
+        if warmup:
+            mark = time.perf_counter()
+            self.pipe([{"role": "user", "content": "Hi"}], max_new_tokens=1)
+            phases["warmup_s"] = time.perf_counter() - mark
+
+        # Chat sessions, least recently used first; key/value caches share a memory budget,
+        # and the least recently used sessions are dropped entirely beyond max_sessions
+        self.sessions = OrderedDict()
+        self.session_cache_bytes = int(session_cache_mb * 1024 * 1024)
+        self.session_evictions = 0
+        self.max_sessions = max_sessions
+        self.sessions_dropped = 0
+
+        self.startup_report = self._startup_report(
+            "OpenAIGPTOSSInference", started, phases, model_cache,
+            {"load_to_device_s": ["download", "weight_load", "device_transfer"]},
+        )
+
+    @staticmethod
+    def _startup_report(name: str, started: float, phases: dict, model_cache: str, combined_phases=None):
+        """Summarize and log where instance startup time went"""
+        import json
+        import os
+        import time
+
+        init_s = time.perf_counter() - started
+        try:
+            # How long this process had run when __init__ began, where /proc is available.
+            # On a reused worker that is its whole lifetime, not boot or install time.
+            process_age_s = time.time() - os.stat(f"/proc/{os.getpid()}").st_ctime - init_s
+        except OSError:
+            process_age_s = None
+
+        report = {
+            "class": name,
+            "process_age_s": process_age_s,
+            "phases": phases,
+            # Phases the loading library performs in one call, so they cannot be timed apart
+            "combined_phases": combined_phases or {},
+            "model_cache": model_cache,
+            "init_s": init_s,
+        }
+        print(f"Startup report: {json.dumps(report)}")
+        return report
+
+    @staticmethod
+    def _model_cache_state(repo_id: str, filename: str):
+        """Whether the model is a local path, or already in the Hugging Face cache"""
+        import os
+
+        if os.path.isdir(repo_id):
+            return "local"
+        try:
+            from huggingface_hub import try_to_load_from_cache
+        except ImportError:
+            return "unknown"
+        return "hit" if isinstance(try_to_load_from_cache(repo_id, filename), str) else "miss"
+
+    def get_startup_report(self):
+        """Cold-start phase timings recorded while this instance was created"""
+        return self.startup_report
 
     def generate(self, messages, max_new_tokens=256):
         """Generate text using the pipeline"""
@@ -43,6 +118,214 @@ class OpenAIGPTOSSInference:
         print(outputs[0]["generated_text"][-1])
         return outputs
 
+    def generate_many(self, conversations, max_new_tokens=256, batch_size=8):
+        """
+        Generate replies for many conversations with padded batch inference.
+
+        Returns one {"message", "prompt_tokens", "completion_tokens"} dict per
+        conversation, in input order. Only the new assistant message is
+        returned, not the conversation history.
+        """
+        tokenizer = self.pipe.tokenizer
+        # Decoder-only models need left padding so every reply starts right after its prompt
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+
+        prompt_tokens = [
+            len(tokenizer(
+                tokenizer.apply_chat_template(conversation, add_generation_prompt=True, tokenize=False),
+                add_special_tokens=False,
+            )["input_ids"])
+            for conversation in conversations
+        ]
+
+        # Batch conversations of similar length together to keep padding small
+        order = sorted(range(len(conversations)), key=lambda i: prompt_tokens[i])
+        outputs = self.pipe(
+            [conversations[i] for i in order],
+            max_new_tokens=max_new_tokens,
+            batch_size=batch_size,
+        )
+
+        results = [None] * len(conversations)
+        for i, output in zip(order, outputs):
+            message = output[0]["generated_text"][-1]
+            results[i] = {
+                "message": message,
+                "prompt_tokens": prompt_tokens[i],
+                "completion_tokens": len(tokenizer.encode(message["content"], add_special_tokens=False)),
+            }
+
+        print(f"Generated {len(results)} replies in batches of {batch_size}")
+        return results
+
+    def start_session(self, messages=None, session_id=None):
+        """Start a chat session, optionally with earlier messages, and return its ID"""
+        import uuid
+
+        session_id = session_id or uuid.uuid4().hex
+        self.sessions[session_id] = {
+            "messages": list(messages or []),
+            "token_ids": [],
+            "past_key_values": None,
+            "nbytes": 0,
+        }
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > self.max_sessions:
+            self.sessions.popitem(last=False)
+            self.sessions_dropped += 1
+        return session_id
+
+    def chat(self, session_id, content, max_new_tokens=256, history=None):
+        """
+        Add a user turn to a session and generate the assistant's reply.
+
+        The key/value cache from the previous turn is reused for the part of
+        the prompt it already covers, so only the new tokens are prefilled.
+        If the cache was evicted, the whole conversation is recomputed.
+
+        A turn can land on a worker that never saw the session, or after the
+        worker scaled down or dropped it. Pass the messages before this turn
+        as `history` and such a session is rebuilt from them, or brought up to
+        date if other workers served some of its turns.
+
+        The session only changes once the reply is generated. If this turn
+        fails, its cache is dropped and its messages are left as they were.
+        """
+        session = self.sessions.get(session_id)
+        rebuilt = session is None
+        if rebuilt:
+            if history is None:
+                raise ValueError(f"Unknown session '{session_id}'; pass history to rebuild it")
+            self.start_session(history, session_id)
+            session = self.sessions[session_id]
+        self.sessions.move_to_end(session_id)
+
+        # If earlier turns were served by another worker, the caller's history wins;
+        # the cache still covers whatever prefix it shares with the new prompt
+        messages = list(session["messages"] if history is None else history)
+        messages.append({"role": "user", "content": content})
+
+        try:
+            turn = self._generate_turn(session, messages, max_new_tokens)
+        except Exception:
+            # crop() and generate() change the cache in place, so it no longer matches token_ids
+            session.update(past_key_values=None, token_ids=[], nbytes=0)
+            raise
+
+        message, output, ids = turn["message"], turn["output"], turn["ids"]
+        sequence = output.sequences[0]
+        session["messages"] = messages + [message]
+
+        # The cache covers every token except the last one generated
+        session["past_key_values"] = output.past_key_values
+        session["token_ids"] = sequence.tolist()[: output.past_key_values.get_seq_length()]
+        session["nbytes"] = self._cache_nbytes(output.past_key_values)
+        self._evict_session_caches()
+
+        return {
+            "session_id": session_id,
+            "message": message,
+            "rebuilt": rebuilt,
+            "prompt_tokens": len(ids),
+            "reused_tokens": turn["reused"],
+            "completion_tokens": len(sequence) - len(ids),
+            "prefill_s": turn["prefill_s"],
+            "total_s": turn["total_s"],
+        }
+
+    def _generate_turn(self, session, messages, max_new_tokens):
+        """Generate the reply to `messages`, reusing as much of the session's cache as matches"""
+        import time
+        from transformers import LogitsProcessor, LogitsProcessorList
+
+        tokenizer, model = self.pipe.tokenizer, self.pipe.model
+        prompt = tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=False)
+        input_ids = tokenizer(prompt, add_special_tokens=False, return_tensors="pt")["input_ids"].to(model.device)
+        ids = input_ids[0].tolist()
+
+        # Keep the cache for the longest prefix it shares with the new prompt
+        cache, cached_ids, reused = session["past_key_values"], session["token_ids"], 0
+        if cache is not None:
+            # At least one token must be left to prefill
+            while reused < min(len(cached_ids), len(ids) - 1) and cached_ids[reused] == ids[reused]:
+                reused += 1
+            try:
+                if reused < len(cached_ids):
+                    cache.crop(reused - len(cached_ids))
+            except RuntimeError:
+                # Sliding-window layers cannot always be rolled back
+                reused = 0
+            if reused == 0:
+                cache = None
+
+        # The first logits are ready once the uncached part of the prompt is prefilled
+        started = time.perf_counter()
+        first_token = {}
+
+        class RecordPrefill(LogitsProcessor):
+            def __call__(self, input_ids, scores):
+                first_token.setdefault("prefill_s", time.perf_counter() - started)
+                return scores
+
+        output = model.generate(
+            input_ids=input_ids,
+            attention_mask=input_ids.new_ones(input_ids.shape),
+            past_key_values=cache,
+            max_new_tokens=max_new_tokens,
+            logits_processor=LogitsProcessorList([RecordPrefill()]),
+            pad_token_id=tokenizer.pad_token_id or tokenizer.eos_token_id,
+            return_dict_in_generate=True,
+        )
+
+        sequence = output.sequences[0]
+        message = {"role": "assistant", "content": tokenizer.decode(sequence[len(ids):], skip_special_tokens=True)}
+        return {
+            "message": message,
+            "output": output,
+            "ids": ids,
+            "reused": reused,
+            "prefill_s": first_token.get("prefill_s"),
+            "total_s": time.perf_counter() - started,
+        }
+
+    def end_session(self, session_id):
+        """Drop a session and free its cache"""
+        return self.sessions.pop(session_id, None) is not None
+
+    def session_stats(self):
+        """Session count and key/value cache memory use"""
+        return {
+            "sessions": len(self.sessions),
+            "cached_sessions": sum(1 for s in self.sessions.values() if s["past_key_values"] is not None),
+            "cache_bytes": sum(s["nbytes"] for s in self.sessions.values()),
+            "cache_budget_bytes": self.session_cache_bytes,
+            "evictions": self.session_evictions,
+            "max_sessions": self.max_sessions,
+            "sessions_dropped": self.sessions_dropped,
+        }
+
+    def _evict_session_caches(self):
+        """Free least recently used caches until they fit the budget; their messages are kept"""
+        total = sum(s["nbytes"] for s in self.sessions.values())
+        for session in self.sessions.values():
+            if total <= self.session_cache_bytes:
+                break
+            if session["past_key_values"] is not None:
+                total -= session["nbytes"]
+                session.update(past_key_values=None, token_ids=[], nbytes=0)
+                self.session_evictions += 1
+
+    @staticmethod
+    def _cache_nbytes(cache):
+        """Memory held by a key/value cache"""
+        if hasattr(cache, "layers"):
+            tensors = [t for layer in cache.layers for t in (layer.keys, layer.values)]
+        else:
+            tensors = list(cache.key_cache) + list(cache.value_cache)
+        return sum(t.numel() * t.element_size() for t in tensors if t is not None)
+
 
 async def main():
     print("🚀 OpenAI GPT OSS Inference")
@@ -61,6 +344,35 @@ async def main():
     outputs = await gpt.generate(messages, max_new_tokens=256)
     print(f"Output: {outputs}")
 
+    # Generate replies for several conversations in one batched call
+    print("\n3️⃣ Batched generation:")
+    conversations = [
+        [{"role": "user", "content": "Name three prime numbers."}],
+        [
+            {"role": "user", "content": "What is the capital of France?"},
+            {"role": "assistant", "content": "Paris."},
+            {"role": "user", "content": "And of Italy?"},
+        ],
+    ]
+
+    results = await gpt.generate_many(conversations, max_new_tokens=64, batch_size=2)
+    for result in results:
+        print(f"   {result['message']['content']} "
+              f"({result['prompt_tokens']} prompt / {result['completion_tokens']} completion tokens)")
+
+    # Multi-turn chat: each turn only prefills the new tokens. The history is kept here
+    # too, so a turn served by another worker can rebuild the session
+    print("\n4️⃣ Chat session:")
+    session_id = await gpt.start_session()
+    history = []
+    for content in ["Suggest a name for a cat.", "Why that name?", "Suggest one for a dog too."]:
+        result = await gpt.chat(session_id, content, max_new_tokens=64, history=history)
+        history += [{"role": "user", "content": content}, result["message"]]
+        print(f"   {result['message']['content']} "
+              f"(reused {result['reused_tokens']}/{result['prompt_tokens']} prompt tokens"
+              f"{', session rebuilt' if result['rebuilt'] else ''})")
+    await gpt.end_session(session_id)
+
     print("\n🎉 Generation completed!")
 
 
@@ -0,0 +1,161 @@
+# # Client-Side Dynamic Batching for MinimalVLLM
+
+# Many coroutines calling `MinimalVLLM.generate_single` at once each make their
+# own remote call with a batch of one. `DynamicBatcher` sits in front of the
+# remote instance instead: concurrent calls are collected until
+# `max_batch_size` is reached or the oldest has waited `max_wait_ms`, then sent
+# as one `generate_batch` call. Each caller gets back only its own result.
+# Per-call sampling overrides ride along, since `generate_batch` accepts them
+# per prompt.
+
+# Run this file to compare unbatched and batched throughput against the local
+# fake engine (no GPU needed):
+#     python vllm_batcher.py --requests 64 --call-overhead-ms 200
+
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+
+class DynamicBatcher:
+    """Drop-in `generate_single` front end that batches concurrent calls."""
+
+    def __init__(self, llm, max_batch_size=32, max_wait_ms=5.0, max_in_flight_batches=1):
+        """
+        Args:
+            llm: MinimalVLLM instance (or anything with an async `generate_batch`)
+            max_batch_size: Prompts sent together in one `generate_batch` call
+            max_wait_ms: How long the first prompt of a batch waits for others
+            max_in_flight_batches: `generate_batch` calls running at once
+        """
+        if max_batch_size < 1 or max_in_flight_batches < 1:
+            raise ValueError("Batch size and in-flight batches must be at least 1")
+
+        self.llm = llm
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.max_in_flight_batches = max_in_flight_batches
+
+        self.requests = 0
+        self.dispatched = 0
+        self.batch_sizes = Counter()
+        self.max_queue_depth = 0
+        self.in_flight_batches = 0
+
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._slots = None
+
+    async def generate_single(self, prompt: str, sampling: dict = None):
+        """Queue one prompt and wait for its result from the next batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.requests += 1
+
+        self._pending.append((prompt, sampling, future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif len(self._pending) == 1:
+            self._timer = loop.call_later(self.max_wait_s, self._dispatch)
+
+        return await future
+
+    def stats(self):
+        """Queue depth and batch size statistics"""
+        batches = sum(self.batch_sizes.values())
+        return {
+            "requests": self.requests,
+            "batches": batches,
+            "mean_batch_size": self.dispatched / batches if batches else 0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight_batches": self.in_flight_batches,
+        }
+
+    def _dispatch(self):
+        """Send up to max_batch_size queued prompts as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_s, self._dispatch)
+        if not batch:
+            return
+
+        self.dispatched += len(batch)
+        self.batch_sizes[len(batch)] += 1
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight_batches)
+
+        prompts = [prompt for prompt, _, _ in batch]
+        sampling = [overrides for _, overrides, _ in batch]
+        try:
+            async with self._slots:
+                self.in_flight_batches += 1
+                try:
+                    results = await self.llm.generate_batch(
+                        prompts, sampling=sampling if any(sampling) else None
+                    )
+                finally:
+                    self.in_flight_batches -= 1
+            if len(results) != len(batch):
+                raise RuntimeError(f"generate_batch returned {len(results)} results for {len(batch)} prompts")
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+async def main():
+    from fake_vllm import LocalWorker, install
+
+    parser = argparse.ArgumentParser(description="Unbatched vs dynamically batched generate_single")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--call-overhead-ms", type=float, default=200.0)
+    parser.add_argument("--step-latency-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    install(step_latency_s=args.step_latency_ms / 1000, call_overhead_s=args.call_overhead_ms / 1000)
+    from vllm_inference import MinimalVLLM
+
+    prompts = [f"Request number {i} is about" for i in range(args.requests)]
+
+    # A single-worker stand-in for the remote endpoint, like `MinimalVLLM()`
+    llm = LocalWorker(MinimalVLLM()._class_type())
+    start = time.perf_counter()
+    await asyncio.gather(*(llm.generate_single(p) for p in prompts))
+    unbatched = time.perf_counter() - start
+    print(f"\n⏱️  unbatched: {unbatched:.2f}s, {args.requests / unbatched:.1f} req/s, {llm.calls} calls")
+
+    llm = LocalWorker(MinimalVLLM()._class_type())
+    batcher = DynamicBatcher(llm, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    start = time.perf_counter()
+    await asyncio.gather(*(batcher.generate_single(p) for p in prompts))
+    batched = time.perf_counter() - start
+    print(f"⏱️  batched:   {batched:.2f}s, {args.requests / batched:.1f} req/s, {llm.calls} calls")
+    print(f"📊 {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+# # Chunked, Resumable Batch Generation with MinimalVLLM
+
+# Sending 50k prompts to `MinimalVLLM.generate_batch` in one call means one
+# enormous request and one enormous result, with no partial progress if
+# anything fails. `generate_chunked` splits the prompt list into chunks under an
+# estimated token budget, sends each chunk as a compact `generate_batch` call,
+# and yields each chunk's results as soon as it (and every chunk before it)
+# is done. Memory stays bounded by the chunk size on both sides of the wire.
+
+# Chunking is deterministic, so a run can resume by skipping the chunks that
+# already completed. The command line runner appends one JSON line per finished
+# chunk to its output file and reads that file back to resume:
+#     python vllm_chunked.py prompts.jsonl --output results.jsonl
+#     python vllm_chunked.py prompts.jsonl --output results.jsonl   # resumes
+#     python vllm_chunked.py prompts.jsonl --fake                  # no GPU
+
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+
+
+def estimate_tokens(prompt: str, chars_per_token: float = 4.0):
+    """Rough prompt length in tokens, without needing the model's tokenizer"""
+    return max(1, int(len(prompt) / chars_per_token) + 1)
+
+
+def plan_chunks(prompts: list, max_chunk_tokens: int, max_tokens: int, max_model_len: int = 1024,
+                chars_per_token: float = 4.0):
+    """
+    Split prompts into (start, end) index ranges under a token budget.
+
+    Each prompt costs its estimated length plus `max_tokens` for its output.
+    A chunk ends before the prompt that would push it past `max_chunk_tokens`;
+    a single prompt larger than the budget gets a chunk of its own.
+    """
+    chunks = []
+    start, used = 0, 0
+    for index, prompt in enumerate(prompts):
+        cost = min(estimate_tokens(prompt, chars_per_token), max_model_len) + max_tokens
+        if index > start and used + cost > max_chunk_tokens:
+            chunks.append((start, index))
+            start, used = index, 0
+        used += cost
+    if start < len(prompts):
+        chunks.append((start, len(prompts)))
+    return chunks
+
+
+def plan_fingerprint(prompts: list, chunks: list):
+    """Identify a chunk plan, so results are never resumed against different inputs"""
+    digest = hashlib.sha256()
+    for prompt in prompts:
+        digest.update(prompt.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(json.dumps(chunks).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+async def generate_chunked(llm, prompts: list, max_chunk_tokens: int = 32768, max_tokens: int = 50,
+                           max_model_len: int = 1024, skip_chunks: set = None,
+                           max_in_flight_chunks: int = 1, chars_per_token: float = 4.0):
+    """
+    Generate for a large prompt list chunk by chunk, yielding results as chunks finish.
+
+    Args:
+        llm: MinimalVLLM instance
+        prompts: All prompts to generate for
+        max_chunk_tokens: Estimated prompt plus output tokens per chunk
+        max_tokens: Output tokens per prompt
+        max_model_len: The model's context length; longer prompts are
+            reported as errors instead of being sent
+        skip_chunks: Chunk indexes that already completed in an earlier run
+        max_in_flight_chunks: Chunks sent at once; results are still yielded
+            in chunk order
+        chars_per_token: Characters per token used to estimate prompt length
+
+    Yields:
+        {"chunk", "start", "end", "results"} for each chunk, in order, where
+        results are per-prompt dicts as returned by `generate_batch`
+    """
+    from vllm_inference import decode_columnar
+
+    skip_chunks = skip_chunks or set()
+    chunks = plan_chunks(prompts, max_chunk_tokens, max_tokens, max_model_len, chars_per_token)
+    todo = [(i, start, end) for i, (start, end) in enumerate(chunks) if i not in skip_chunks]
+
+    async def run_chunk(start: int, end: int):
+        chunk_prompts = prompts[start:end]
+        fits = [estimate_tokens(p, chars_per_token) + max_tokens <= max_model_len for p in chunk_prompts]
+        sendable = [p for p, ok in zip(chunk_prompts, fits) if ok]
+
+        decoded = []
+        if sendable:
+            result = await llm.generate_batch(
+                sendable,
+                sampling=[{"max_tokens": max_tokens}] * len(sendable),
+                compact=True,
+                echo_prompts=False,
+            )
+            decoded = decode_columnar(result, sendable)
+
+        generated = iter(decoded)
+        return [
+            next(generated) if ok else {"prompt": p, "error": f"Prompt exceeds max_model_len={max_model_len}"}
+            for p, ok in zip(chunk_prompts, fits)
+        ]
+
+    # Run up to max_in_flight_chunks ahead of the chunk being yielded
+    tasks = {}
+    position = 0
+    try:
+        for order, (i, start, end) in enumerate(todo):
+            while position < len(todo) and position < order + max_in_flight_chunks:
+                _, next_start, next_end = todo[position]
+                tasks[position] = asyncio.ensure_future(run_chunk(next_start, next_end))
+                position += 1
+
+            results = await tasks.pop(order)
+            yield {"chunk": i, "start": start, "end": end, "results": results}
+    finally:
+        for task in tasks.values():
+            task.cancel()
+
+
+def completed_chunks(output_path: str, fingerprint: str):
+    """Read back which chunks an earlier run already wrote to its output file"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a partially written last line
+                continue
+            if record.get("fingerprint") != fingerprint:
+                raise ValueError(f"{output_path} was written for different prompts or chunk settings")
+            done.add(record["chunk"])
+    return done
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Chunked, resumable MinimalVLLM batch generation")
+    parser.add_argument("input", help="JSONL file with a 'prompt' field per line")
+    parser.add_argument("--output", default="vllm_chunked_results.jsonl")
+    parser.add_argument("--max-chunk-tokens", type=int, default=32768)
+    parser.add_argument("--max-tokens", type=int, default=50)
+    parser.add_argument("--max-in-flight-chunks", type=int, default=1)
+    parser.add_argument("--fake", action="store_true", help="Run against the local fake engine")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        prompts = [json.loads(line)["prompt"] for line in f if line.strip()]
+
+    if args.fake:
+        from fake_vllm import LocalWorker, install
+
+        install(step_latency_s=0.001, call_overhead_s=0.05)
+    from vllm_inference import MinimalVLLM
+
+    llm = MinimalVLLM()
+    if args.fake:
+        llm = LocalWorker(llm._class_type())
+
+    chunks = plan_chunks(prompts, args.max_chunk_tokens, args.max_tokens)
+    fingerprint = plan_fingerprint(prompts, chunks)
+    done = completed_chunks(args.output, fingerprint)
+    print(f"📋 {len(prompts):,} prompts in {len(chunks)} chunks, {len(done)} already done")
+
+    with open(args.output, "a", encoding="utf-8") as out:
+        async for chunk in generate_chunked(
+            llm,
+            prompts,
+            max_chunk_tokens=args.max_chunk_tokens,
+            max_tokens=args.max_tokens,
+            skip_chunks=done,
+            max_in_flight_chunks=args.max_in_flight_chunks,
+        ):
+            # One line per chunk: a crash mid-write leaves a line that resume ignores
+            out.write(json.dumps({"fingerprint": fingerprint, **chunk}) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            print(f"   ✅ chunk {chunk['chunk'] + 1}/{len(chunks)} "
+                  f"(prompts {chunk['start']}-{chunk['end'] - 1})")
+
+    print(f"🎉 Results in {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -9,6 +9,12 @@
 # - Efficient batch processing for multiple prompts
 # - Memory-optimized configuration for smaller GPU instances
 # - Environment variable configuration for vLLM stability
+# - Token streaming with time-to-first-token and inter-token latency per prompt
+#   (try it without a GPU: `python fake_vllm.py`)
+# - Client-side dynamic batching of concurrent generate_single calls
+#   (see vllm_batcher.py)
+# - Compact columnar results for large batches (`compact=True`, `decode_columnar`)
+# - Chunked, resumable runs over huge prompt lists (see vllm_chunked.py)
 
 
 import asyncio
@@ -26,26 +32,90 @@ gpu_config = LiveServerless(
     hf_models_to_cache=["facebook/opt-125m"],
 )
 class MinimalVLLM:
-    def __init__(self):
+    def __init__(self, warmup: bool = False):
+        import time
+
+        # Cold-start phases, returned by get_startup_report()
+        started = time.perf_counter()
+        phases = {}
+
         from vllm import LLM, SamplingParams
         import os
-        
+        phases["imports_s"] = time.perf_counter() - started
         
         os.environ["VLLM_USE_V1"] = "0"
         os.environ["VLLM_WORKER_MULTIPROC_METHOD"] = "spawn"
         
+        # vLLM downloads (on a cache miss), loads and moves weights in one step
+        model_cache = self._model_cache_state("facebook/opt-125m", "config.json")
+        mark = time.perf_counter()
         self.llm = LLM(
             model="facebook/opt-125m",
             enforce_eager=True,  # Disable CUDA graphs
             gpu_memory_utilization=0.6,
             max_model_len=1024,
         )
-        self.sampling_params = SamplingParams(temperature=0.8, max_tokens=50)
+        phases["load_to_device_s"] = time.perf_counter() - mark
+        self.default_sampling = {"temperature": 0.8, "max_tokens": 50}
+        self.sampling_params = SamplingParams(**self.default_sampling)
+
+        if warmup:
+            mark = time.perf_counter()
+            self.llm.generate(["Hello"], SamplingParams(max_tokens=1))
+            phases["warmup_s"] = time.perf_counter() - mark
         
+        self.startup_report = self._startup_report(
+            "MinimalVLLM", started, phases, model_cache,
+            {"load_to_device_s": ["download", "weight_load", "device_transfer"]},
+        )
         print("vLLM initialized successfully!")
     
     
-    def test_generate(self):
+    @staticmethod
+    def _startup_report(name: str, started: float, phases: dict, model_cache: str, combined_phases=None):
+        """Summarize and log where instance startup time went"""
+        import json
+        import os
+        import time
+
+        init_s = time.perf_counter() - started
+        try:
+            # How long this process had run when __init__ began, where /proc is available.
+            # On a reused worker that is its whole lifetime, not boot or install time.
+            process_age_s = time.time() - os.stat(f"/proc/{os.getpid()}").st_ctime - init_s
+        except OSError:
+            process_age_s = None
+
+        report = {
+            "class": name,
+            "process_age_s": process_age_s,
+            "phases": phases,
+            # Phases the loading library performs in one call, so they cannot be timed apart
+            "combined_phases": combined_phases or {},
+            "model_cache": model_cache,
+            "init_s": init_s,
+        }
+        print(f"Startup report: {json.dumps(report)}")
+        return report
+
+    @staticmethod
+    def _model_cache_state(repo_id: str, filename: str):
+        """Whether the model is a local path, or already in the Hugging Face cache"""
+        import os
+
+        if os.path.isdir(repo_id):
+            return "local"
+        try:
+            from huggingface_hub import try_to_load_from_cache
+        except ImportError:
+            return "unknown"
+        return "hit" if isinstance(try_to_load_from_cache(repo_id, filename), str) else "miss"
+
+    def get_startup_report(self):
+        """Cold-start phase timings recorded while this instance was created"""
+        return self.startup_report
+
+    def test_generate(self, compact: bool = False):
         # Multiple test prompts
         prompts = [
             "Hello, my name is",
@@ -60,13 +130,12 @@ class MinimalVLLM:
         
         print(f"Generating for {len(prompts)} prompts...")
         outputs = self.llm.generate(prompts, self.sampling_params)
+        if compact:
+            return self._encode_columnar(outputs, echo_prompts=True, include_token_ids=False)
         
         results = []
         for output in outputs:
-            results.append({
-                "prompt": output.prompt,
-                "output": output.outputs[0].text
-            })
+            results.append(self._format_output(output))
         
         return results
     
@@ -75,25 +144,226 @@ class MinimalVLLM:
         print(f"Generating for: '{prompt}'")
         outputs = self.llm.generate([prompt], self.sampling_params)
         
-        return {
-            "prompt": prompt,
-            "output": outputs[0].outputs[0].text
-        }
+        return self._format_output(outputs[0])
     
-    def generate_batch(self, prompts: list):
-        """Generate for multiple prompts"""
+    def generate_batch(
+        self,
+        prompts: list,
+        sampling: list = None,
+        compact: bool = False,
+        echo_prompts: bool = True,
+        include_token_ids: bool = False,
+    ):
+        """
+        Generate for multiple prompts in one vLLM batch.
+
+        `sampling` optionally holds one dict per prompt overriding any of
+        max_tokens, temperature, top_p, stop and seed (None keeps the
+        defaults). Mixed settings still share a single batched forward pass.
+
+        With `compact=True` the result is a single columnar dict (see
+        `decode_columnar`) instead of one dict per prompt; `echo_prompts=False`
+        leaves the prompts out of it entirely, and `include_token_ids=True`
+        adds every output token ID as one packed integer buffer.
+        """
         print(f"Batch generating for {len(prompts)} prompts...")
-        outputs = self.llm.generate(prompts, self.sampling_params)
+        outputs = self.llm.generate(prompts, self._sampling_params_for(prompts, sampling))
+        if compact:
+            return self._encode_columnar(outputs, echo_prompts, include_token_ids)
         
         results = []
         for output in outputs:
-            results.append({
-                "prompt": output.prompt,
-                "output": output.outputs[0].text
-            })
+            results.append(self._format_output(output))
         
         return results
 
+    def _sampling_params_for(self, prompts: list, sampling: list = None):
+        """Build per-prompt SamplingParams from the defaults plus optional overrides"""
+        from vllm import SamplingParams
+
+        if sampling is None:
+            return self.sampling_params
+        if len(sampling) != len(prompts):
+            raise ValueError(f"Got {len(sampling)} sampling overrides for {len(prompts)} prompts")
+
+        allowed = {"max_tokens", "temperature", "top_p", "stop", "seed"}
+        params = []
+        for overrides in sampling:
+            overrides = overrides or {}
+            unknown = set(overrides) - allowed
+            if unknown:
+                raise ValueError(f"Unsupported sampling overrides: {sorted(unknown)}")
+            params.append(SamplingParams(**{**self.default_sampling, **overrides}))
+        return params
+
+    def _format_output(self, output):
+        """Convert a vLLM RequestOutput into a result dict"""
+        completion = output.outputs[0]
+        return {
+            "prompt": output.prompt,
+            "output": completion.text,
+            "finish_reason": completion.finish_reason,
+            "prompt_tokens": len(output.prompt_token_ids or []),
+            "completion_tokens": len(completion.token_ids),
+        }
+
+    def _encode_columnar(self, outputs, echo_prompts: bool, include_token_ids: bool):
+        """Encode outputs as parallel arrays, optionally with all token IDs packed into one little-endian uint32 buffer"""
+        import array
+        import sys
+
+        token_ids = array.array("I" if array.array("I").itemsize == 4 else "L")
+        token_offsets = [0]
+        for output in outputs:
+            token_ids.extend(output.outputs[0].token_ids)
+            token_offsets.append(len(token_ids))
+        if sys.byteorder == "big":
+            token_ids.byteswap()
+
+        return {
+            "format": "columnar-v1",
+            "prompts": [output.prompt for output in outputs] if echo_prompts else None,
+            "outputs": [output.outputs[0].text for output in outputs],
+            "finish_reasons": [output.outputs[0].finish_reason for output in outputs],
+            "prompt_tokens": [len(output.prompt_token_ids or []) for output in outputs],
+            "token_ids": token_ids.tobytes() if include_token_ids else None,
+            "token_offsets": token_offsets,
+        }
+
+    def _stream_outputs(self, prompts: list, sampling: list = None):
+        """Drive the vLLM engine step by step, yielding a text delta whenever a prompt gains tokens"""
+        import time
+        import uuid
+
+        engine = self.llm.llm_engine
+        started = time.perf_counter()
+
+        params = self._sampling_params_for(prompts, sampling)
+        if not isinstance(params, list):
+            params = [params] * len(prompts)
+
+        requests = {}
+        for index, prompt in enumerate(prompts):
+            request_id = f"stream-{uuid.uuid4().hex}"
+            engine.add_request(request_id, prompt, params[index])
+            requests[request_id] = {"index": index, "text": "", "tokens": 0, "token_times": []}
+
+        unfinished = set(requests)
+        try:
+            while unfinished and engine.has_unfinished_requests():
+                step_outputs = engine.step()
+                now = time.perf_counter()
+
+                for output in step_outputs:
+                    state = requests.get(output.request_id)
+                    if state is None:
+                        continue
+                    completion = output.outputs[0]
+
+                    new_tokens = len(completion.token_ids) - state["tokens"]
+                    if new_tokens > 0:
+                        state["token_times"].extend([now] * new_tokens)
+                        state["tokens"] = len(completion.token_ids)
+
+                    delta = completion.text[len(state["text"]):]
+                    state["text"] = completion.text
+                    event = {"index": state["index"], "delta": delta, "finished": output.finished}
+
+                    if output.finished:
+                        unfinished.discard(output.request_id)
+                        times = state["token_times"]
+                        event.update({
+                            "prompt": output.prompt,
+                            "output": completion.text,
+                            "finish_reason": completion.finish_reason,
+                            "tokens": state["tokens"],
+                            "ttft_s": times[0] - started if times else None,
+                            "mean_itl_s": (times[-1] - times[0]) / (len(times) - 1) if len(times) > 1 else None,
+                        })
+
+                    if delta or output.finished:
+                        yield event
+        finally:
+            # Stop generating for prompts the caller no longer listens to
+            if unfinished:
+                engine.abort_request(list(unfinished))
+
+    async def stream_batch(self, prompts: list, sampling: list = None):
+        """
+        Stream text deltas for multiple prompts as vLLM produces them.
+
+        Yields {"index", "delta", "finished"} events. The final event for each
+        prompt also carries its full output, finish reason, token count,
+        time-to-first-token and mean inter-token latency. `sampling` takes
+        per-prompt overrides, as in generate_batch.
+        """
+        import asyncio
+
+        print(f"Streaming generation for {len(prompts)} prompts...")
+        stream = self._stream_outputs(prompts, sampling)
+        try:
+            for event in stream:
+                yield event
+                # Let other coroutines (e.g. the consumer's I/O) run between steps
+                await asyncio.sleep(0)
+        finally:
+            stream.close()
+
+    async def stream_single(self, prompt: str):
+        """Stream text deltas for a single prompt"""
+        async for event in self.stream_batch([prompt]):
+            yield event
+
+    def generate_batch_timed(self, prompts: list, sampling: list = None):
+        """Generate for multiple prompts through the streaming path, reporting TTFT and inter-token latency"""
+        print(f"Timed batch generation for {len(prompts)} prompts...")
+        results = [None] * len(prompts)
+        for event in self._stream_outputs(prompts, sampling):
+            if event["finished"]:
+                results[event["index"]] = {
+                    key: event[key]
+                    for key in ("prompt", "output", "finish_reason", "tokens", "ttft_s", "mean_itl_s")
+                }
+
+        return results
+
+def decode_columnar(result, prompts: list = None, include_token_ids: bool = False):
+    """
+    Decode a compact `generate_batch` result back into the per-prompt dict shape.
+
+    Pass the original `prompts` when the batch ran with `echo_prompts=False`.
+    Token IDs are only unpacked into each dict when `include_token_ids` is set
+    and the batch ran with `include_token_ids=True`.
+    """
+    import array
+    import sys
+
+    if result.get("format") != "columnar-v1":
+        raise ValueError(f"Unsupported result format: {result.get('format')!r}")
+
+    prompts = result["prompts"] if result["prompts"] is not None else prompts
+    offsets = result["token_offsets"]
+    include_token_ids = include_token_ids and result["token_ids"] is not None
+    if include_token_ids:
+        token_ids = array.array("I" if array.array("I").itemsize == 4 else "L")
+        token_ids.frombytes(result["token_ids"])
+        if sys.byteorder == "big":
+            token_ids.byteswap()
+
+    decoded = []
+    for i, output in enumerate(result["outputs"]):
+        item = {
+            "prompt": prompts[i] if prompts is not None else None,
+            "output": output,
+            "finish_reason": result["finish_reasons"][i],
+            "prompt_tokens": result["prompt_tokens"][i],
+            "completion_tokens": offsets[i + 1] - offsets[i],
+        }
+        if include_token_ids:
+            item["token_ids"] = token_ids[offsets[i]:offsets[i + 1]].tolist()
+        decoded.append(item)
+    return decoded
+
 async def main():
     print("🚀 Testing vLLM with MULTIPLE SEPARATE REQUESTS")
     print("=" * 60)
@@ -138,7 +408,31 @@ async def main():
     for i, result in enumerate(test_results[:3], 1):  # Show first 3
         print(f"   {i}. '{result['prompt']}' → '{result['output'][:50]}...'")
     print(f"   ... and {len(test_results) - 3} more")
-    
+
+    # REQUEST 6: Latency profile of the streaming path. Remote calls return one
+    # complete response, so the stream is drained on the worker; run
+    # `python fake_vllm.py` to consume stream_batch deltas locally.
+    print("\n7️⃣ REQUEST 6 - Time to first token:")
+    timed_results = await llm.generate_batch_timed(batch_prompts)
+    for i, result in enumerate(timed_results, 1):
+        itl = result['mean_itl_s'] or 0
+        print(f"   {i}. TTFT {result['ttft_s'] * 1000:.0f}ms | "
+              f"{itl * 1000:.1f}ms/token | {result['tokens']} tokens")
+
+    # REQUEST 7: Different sampling settings per prompt, still one vLLM batch
+    print("\n8️⃣ REQUEST 7 - Mixed sampling settings in one batch:")
+    mixed_results = await llm.generate_batch(
+        batch_prompts,
+        sampling=[
+            {"temperature": 0.0, "max_tokens": 10},
+            {"temperature": 1.0, "top_p": 0.9, "seed": 42},
+            {"max_tokens": 30, "stop": ["."]},
+        ],
+    )
+    for i, result in enumerate(mixed_results, 1):
+        print(f"   {i}. {result['completion_tokens']} tokens ({result['finish_reason']}) "
+              f"→ '{result['output']}'")
+
     print("\n" + "=" * 60)
     print("🎉 ALL REQUESTS COMPLETED!")
 
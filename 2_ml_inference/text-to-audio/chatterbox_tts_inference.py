@@ -4,7 +4,8 @@
 # with the Tetra framework. It showcases:
 # - TTS model loading with GPU acceleration
 # - Text-to-audio generation from prompts
-# - Local audio file saving in WAV format
+# - Compact audio transport (16-bit PCM, FLAC or Opus) with optional downsampling
+# - Local audio file saving in the delivered format
 
 import asyncio
 from pathlib import Path
@@ -21,33 +22,144 @@ gpu_config = LiveServerless(
     dependencies=["chatterbox-tts==0.1.1", "torch", "torchaudio", "setuptools"],
 )
 class ChatterboxTTSInference:
-    def __init__(self):
+    def __init__(self, warmup=False):
+        import time
+
+        # Cold-start phases, returned by get_startup_report()
+        started = time.perf_counter()
+        phases = {}
+
         import torchaudio as ta
         from chatterbox.tts import ChatterboxTTS
         import io
+        phases["imports_s"] = time.perf_counter() - started
 
         self.io = io
         self.ta = ta
+
+        # from_pretrained downloads (on a cache miss), loads and moves weights in one step
+        model_cache = self._model_cache_state("ResembleAI/chatterbox", "s3gen.safetensors")
+        mark = time.perf_counter()
         self.model = ChatterboxTTS.from_pretrained(device="cuda")
+        phases["load_to_device_s"] = time.perf_counter() - mark
+
+        if warmup:
+            mark = time.perf_counter()
+            self.model.generate("Hi.")
+            phases["warmup_s"] = time.perf_counter() - mark
+
+        self.startup_report = self._startup_report(
+            "ChatterboxTTSInference", started, phases, model_cache,
+            {"load_to_device_s": ["download", "weight_load", "device_transfer"]},
+        )
         print("Chatterbox TTS model loaded successfully!")
 
-    def generate(self, prompt: str):
-        """Generate audio from text prompt and return audio data"""
+    @staticmethod
+    def _startup_report(name: str, started: float, phases: dict, model_cache: str, combined_phases=None):
+        """Summarize and log where instance startup time went"""
+        import json
+        import os
+        import time
+
+        init_s = time.perf_counter() - started
+        try:
+            # How long this process had run when __init__ began, where /proc is available.
+            # On a reused worker that is its whole lifetime, not boot or install time.
+            process_age_s = time.time() - os.stat(f"/proc/{os.getpid()}").st_ctime - init_s
+        except OSError:
+            process_age_s = None
+
+        report = {
+            "class": name,
+            "process_age_s": process_age_s,
+            "phases": phases,
+            # Phases the loading library performs in one call, so they cannot be timed apart
+            "combined_phases": combined_phases or {},
+            "model_cache": model_cache,
+            "init_s": init_s,
+        }
+        print(f"Startup report: {json.dumps(report)}")
+        return report
+
+    @staticmethod
+    def _model_cache_state(repo_id: str, filename: str):
+        """Whether the model is a local path, or already in the Hugging Face cache"""
+        import os
+
+        if os.path.isdir(repo_id):
+            return "local"
+        try:
+            from huggingface_hub import try_to_load_from_cache
+        except ImportError:
+            return "unknown"
+        return "hit" if isinstance(try_to_load_from_cache(repo_id, filename), str) else "miss"
+
+    def get_startup_report(self):
+        """Cold-start phase timings recorded while this instance was created"""
+        return self.startup_report
+
+    def generate(self, prompt: str, codec: str = "wav", target_sample_rate: int = 0):
+        """Generate audio from text prompt and return audio data
+
+        codec selects the transport encoding: "wav" (float32), "pcm16", "flac"
+        or "opus". target_sample_rate optionally downsamples before encoding.
+        """
         print(f"Generating audio for: '{prompt}'")
 
         # Generate audio waveform from the input text
         wav = self.model.generate(prompt)
 
-        # Create buffer and save audio data to return
-        buffer = self.io.BytesIO()
-        self.ta.save(buffer, wav, self.model.sr, format="wav")
-        buffer.seek(0)
+        # Optionally downsample; speech stays intelligible well below 24 kHz
+        sample_rate = self.model.sr
+        if target_sample_rate and target_sample_rate != sample_rate:
+            wav = self.ta.functional.resample(wav, sample_rate, target_sample_rate)
+            sample_rate = target_sample_rate
+
+        audio_data, codec_info, encode_time_s = self._encode_audio(wav, sample_rate, codec)
 
         return {
             "prompt": prompt,
-            "audio_data": buffer.getvalue(),  # Return raw bytes
-            "sample_rate": self.model.sr,
+            "audio_data": audio_data,  # Return encoded bytes
+            "sample_rate": sample_rate,
+            "encode_time_s": encode_time_s,
+            **codec_info,
+        }
+
+    @staticmethod
+    def _encode_audio(wav, sample_rate: int, codec: str):
+        """Encode a waveform, falling back to more widely supported codecs"""
+        import io
+        import time
+        import torchaudio as ta
+
+        codecs = {
+            "wav": ({"format": "wav"}, "wav", "audio/wav"),
+            "pcm16": ({"format": "wav", "encoding": "PCM_S", "bits_per_sample": 16}, "wav", "audio/wav"),
+            "flac": ({"format": "flac", "bits_per_sample": 16}, "flac", "audio/flac"),
+            "opus": ({"format": "ogg", "encoding": "OPUS"}, "ogg", "audio/ogg"),
         }
+        fallbacks = {"opus": ["opus", "flac", "pcm16"], "flac": ["flac", "pcm16"]}
+
+        if codec not in codecs:
+            raise ValueError(f"Unsupported codec '{codec}', expected one of {sorted(codecs)}")
+
+        for candidate in fallbacks.get(codec, [codec]):
+            save_kwargs, extension, mime_type = codecs[candidate]
+            start = time.perf_counter()
+            try:
+                buffer = io.BytesIO()
+                ta.save(buffer, wav, sample_rate, **save_kwargs)
+            except Exception as e:
+                print(f"Codec '{candidate}' unavailable ({e}), trying a fallback")
+                continue
+
+            return buffer.getvalue(), {
+                "codec": candidate,
+                "file_extension": extension,
+                "mime_type": mime_type,
+            }, time.perf_counter() - start
+
+        raise RuntimeError(f"No available encoder for codec '{codec}'")
 
 
 async def main():
@@ -72,16 +184,16 @@ async def main():
     print(f"\n2️⃣ Generating audio for {len(prompts)} prompts:")
 
     for i, prompt in enumerate(prompts, 1):
-        # Generate audio on remote GPU
+        # Generate audio on remote GPU; pass codec="pcm16", "flac" or "opus" for smaller transfers
         result = await tts.generate(prompt)
 
-        # Save audio data locally
-        output_path = output_dir / f"output_{i}.wav"
+        # Save audio data locally in whichever format arrived
+        output_path = output_dir / f"output_{i}.{result['file_extension']}"
         with open(output_path, "wb") as f:
             f.write(result["audio_data"])
 
         print(f"   {i}. Generated audio for: '{prompt[:50]}...'")
-        print(f"      Saved locally to: {output_path}")
+        print(f"      Saved locally to: {output_path} ({len(result['audio_data']):,} bytes, {result['codec']})")
 
     print(f"\n🎉 Generated {len(prompts)} audio files in {output_dir}/")
 
@@ -0,0 +1,185 @@
+"""
+Streaming Batch Runner
+
+Runs the LLM to TTS pipeline over a JSONL file of prompts of any size. Prompts
+are read lazily, at most --max-in-flight of them are in the pipeline at once,
+and one result record per prompt is appended to an output JSONL as soon as it
+finishes. Audio bytes are dropped once they are handed to the result writer,
+so memory use stays flat no matter how many prompts the input holds.
+
+USAGE:
+    python batch_runner.py prompts.jsonl --output results.jsonl
+    python batch_runner.py prompts.jsonl --output results.jsonl --resume
+    python batch_runner.py prompts.jsonl --stub   # local run, no GPUs
+
+Each input line is a JSON object with the prompt under --prompt-field
+(default "prompt") and an optional ID under --id-field (default "id"); the
+line number is used when the ID is missing. With --resume, prompts that
+already have a successful record in the output file are skipped. Stub runs
+default to their own llm_tts_stub_results directory, so their records and
+stage cache never mix with real results.
+"""
+
+from typing import Iterator, Set, Tuple
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from config import LLM_MODEL_NAME, LLM_SYSTEM_PROMPT
+from orchestrator import LLMToTTSOrchestrator
+from tts_batcher import TTSMicroBatcher
+
+
+def read_jobs(
+    path: str, prompt_field: str, id_field: str, skip: Set[str]
+) -> Iterator[Tuple[str, str]]:
+    """Lazily yield ``(job_id, prompt)`` pairs from a JSONL file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                prompt = record[prompt_field]
+            except (json.JSONDecodeError, KeyError) as e:
+                print(f"   ⚠️  Skipping line {line_number}: {e}")
+                continue
+
+            job_id = str(record.get(id_field, line_number))
+            if job_id not in skip:
+                yield job_id, prompt
+
+
+def completed_job_ids(output_path: str) -> Set[str]:
+    """Collect the IDs of jobs with a successful record in an output file."""
+    done: Set[str] = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a partially written last line
+                continue
+            if record.get("success"):
+                done.add(record["job_id"])
+    return done
+
+
+def create_services(use_stubs: bool):
+    """Create the remote services, or local stand-ins for a dry run."""
+    if use_stubs:
+        from stub_services import StubLLMTextGenerator, StubTTSAudioGenerator
+
+        return StubLLMTextGenerator(), StubTTSAudioGenerator()
+
+    from llm_service import LLMTextGenerator
+    from tts_service import TTSAudioGenerator
+
+    llm_service = LLMTextGenerator(
+        model_name=LLM_MODEL_NAME, system_prompt=LLM_SYSTEM_PROMPT
+    )
+    return llm_service, TTSAudioGenerator()
+
+
+async def main() -> None:
+    """Stream prompts from a JSONL file through the pipeline."""
+    parser = argparse.ArgumentParser(description="Run the LLM to TTS pipeline over a JSONL file")
+    parser.add_argument("input", help="JSONL file with one prompt object per line")
+    parser.add_argument("--output", default=None,
+                        help="JSONL file that result records are appended to "
+                             "(default: <output-dir>/batch_results.jsonl)")
+    parser.add_argument("--output-dir", default=None,
+                        help="Directory for saved texts, audio and the stage cache "
+                             "(default: llm_tts_results, or llm_tts_stub_results with --stub)")
+    parser.add_argument("--prompt-field", default="prompt")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--max-in-flight", type=int, default=64,
+                        help="Prompts in the pipeline at once")
+    parser.add_argument("--llm-concurrency", type=int, default=1)
+    parser.add_argument("--tts-concurrency", type=int, default=1)
+    parser.add_argument("--tts-batch-size", type=int, default=1,
+                        help="Coalesce concurrent TTS calls into batches of this size")
+    parser.add_argument("--tts-batch-window-ms", type=float, default=10.0,
+                        help="How long a TTS call waits for others to batch with")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip prompts already successful in --output")
+    parser.add_argument("--progress-every", type=int, default=100,
+                        help="Report progress every N prompts; 0 disables progress output")
+    parser.add_argument("--stub", action="store_true",
+                        help="Use local stub services instead of remote GPUs")
+    args = parser.parse_args()
+
+    if args.progress_every < 0:
+        parser.error("--progress-every must be 0 or more")
+    if args.output_dir is None:
+        args.output_dir = "llm_tts_stub_results" if args.stub else "llm_tts_results"
+    if args.output is None:
+        args.output = os.path.join(args.output_dir, "batch_results.jsonl")
+
+    skip = completed_job_ids(args.output) if args.resume else set()
+    if skip:
+        print(f"♻️  Resuming: {len(skip):,} prompts already completed")
+
+    llm_service, tts_service = create_services(args.stub)
+    if args.tts_batch_size > 1:
+        # Batches only fill up if enough TTS calls are allowed in flight
+        tts_service = TTSMicroBatcher(
+            tts_service,
+            max_batch_size=args.tts_batch_size,
+            max_wait_s=args.tts_batch_window_ms / 1000,
+        )
+        args.tts_concurrency = max(args.tts_concurrency, args.tts_batch_size)
+    orchestrator = LLMToTTSOrchestrator(
+        llm_service,
+        tts_service,
+        output_dir=args.output_dir,
+        cache_namespace="stub" if args.stub else "remote",
+        metrics_window=10_000,
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    jobs = read_jobs(args.input, args.prompt_field, args.id_field, skip)
+
+    print(f"\n📋 Streaming {args.input} → {args.output} "
+          f"(in flight {args.max_in_flight}, LLM x{args.llm_concurrency}, "
+          f"TTS x{args.tts_concurrency})")
+
+    succeeded = failed = 0
+    started_at = time.perf_counter()
+    try:
+        with open(args.output, "a", encoding="utf-8") as out:
+            async for result in orchestrator.iter_stream(
+                jobs,
+                max_in_flight=args.max_in_flight,
+                llm_concurrency=args.llm_concurrency,
+                tts_concurrency=args.tts_concurrency,
+            ):
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                if result.get("success"):
+                    succeeded += 1
+                else:
+                    failed += 1
+                    print(f"   ❌ {result['job_id']}: {result.get('error')}")
+
+                done = succeeded + failed
+                if args.progress_every and done % args.progress_every == 0:
+                    out.flush()
+                    rate = done / (time.perf_counter() - started_at)
+                    print(f"   ✅ {done:,} done ({failed:,} failed, {rate:.1f} prompts/s)")
+    finally:
+        # Make sure queued result files reach disk even if the run is interrupted
+        await orchestrator.close()
+
+    elapsed = time.perf_counter() - started_at
+    print("\n" + "=" * 60)
+    print(f"✅ Successful: {succeeded:,} | ❌ Failed: {failed:,} | ⏱️  {elapsed:.1f}s")
+    print(f"📁 Records written to: {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,270 @@
+"""
+Local Pipeline Benchmark
+
+Measures orchestrator execution modes against stub services that sleep instead
+of calling remote GPUs, so changes to the pipeline can be compared locally.
+
+USAGE:
+    python benchmark.py batch --prompts 8 --llm-latency 0.2 --tts-latency 0.2
+    python benchmark.py ttfa --llm-latency 1.0 --tts-char-latency 0.005
+    python benchmark.py cache --prompts 10 --repeat-ratio 0.3
+    python benchmark.py tts-batch --prompts 32 --tts-batch-size 8
+    python benchmark.py codecs --seconds 10
+    python benchmark.py llm-batch --model HuggingFaceTB/SmolLM2-135M-Instruct
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from orchestrator import LLMToTTSOrchestrator
+from stub_services import StubLLMTextGenerator, StubTTSAudioGenerator
+from tts_batcher import TTSMicroBatcher
+
+
+async def benchmark_batch(args: argparse.Namespace) -> None:
+    """Compare sequential and pipelined batch wall-clock time."""
+    prompts = [f"topic number {i}" for i in range(args.prompts)]
+
+    modes = (
+        ("sequential", False, 1),
+        ("pipelined", True, 1),
+        (f"pipelined, LLM batches of {args.llm_batch_size}", True, args.llm_batch_size),
+    )
+
+    for label, pipelined, llm_batch_size in modes:
+        with tempfile.TemporaryDirectory() as output_dir:
+            orchestrator = LLMToTTSOrchestrator(
+                StubLLMTextGenerator(latency_s=args.llm_latency),
+                StubTTSAudioGenerator(latency_s=args.tts_latency),
+                output_dir=output_dir,
+            )
+
+            start = time.perf_counter()
+            results = await orchestrator.process_batch(
+                prompts,
+                pipelined=pipelined,
+                llm_concurrency=args.llm_concurrency,
+                tts_concurrency=args.tts_concurrency,
+                llm_batch_size=llm_batch_size,
+            )
+            elapsed = time.perf_counter() - start
+            await orchestrator.close()
+
+        successful = sum(1 for r in results if r.get("success"))
+        print(f"\n⏱️  {label}: {elapsed:.2f}s for {successful}/{len(prompts)} prompts")
+
+
+async def benchmark_ttfa(args: argparse.Namespace) -> None:
+    """Compare time-to-first-audio of the streaming and non-streaming paths."""
+    prompt = "renewable energy"
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        orchestrator = LLMToTTSOrchestrator(
+            StubLLMTextGenerator(latency_s=args.llm_latency),
+            StubTTSAudioGenerator(
+                latency_s=args.tts_latency, per_char_latency_s=args.tts_char_latency
+            ),
+            output_dir=output_dir,
+            # Both paths share the LLM cache; the streaming run must not hit it
+            use_cache=False,
+        )
+
+        # Audio only becomes available once the whole pipeline has finished
+        start = time.perf_counter()
+        await orchestrator.process_prompt(prompt)
+        blocking_ttfa = time.perf_counter() - start
+
+        streamed = await orchestrator.process_prompt_streaming(prompt)
+        await orchestrator.close()
+
+    print(f"\n⏱️  non-streaming: TTFA {blocking_ttfa:.2f}s, total {blocking_ttfa:.2f}s")
+    print(f"⏱️  streaming:     TTFA {streamed['time_to_first_audio_s']:.2f}s, "
+          f"total {streamed['total_time_s']:.2f}s "
+          f"({streamed['tts_result']['chunk_count']} chunks)")
+
+
+async def benchmark_cache(args: argparse.Namespace) -> None:
+    """Run the same prompt set twice against one stage cache: cold, then warm."""
+    unique = max(1, int(args.prompts * (1 - args.repeat_ratio)))
+    prompts = [f"topic number {i % unique}" for i in range(args.prompts)]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for label in ("cold", "warm"):
+            orchestrator = LLMToTTSOrchestrator(
+                StubLLMTextGenerator(latency_s=args.llm_latency),
+                StubTTSAudioGenerator(latency_s=args.tts_latency),
+                output_dir=output_dir,
+            )
+
+            start = time.perf_counter()
+            results = await orchestrator.process_batch(prompts)
+            elapsed = time.perf_counter() - start
+            await orchestrator.close()
+
+            cache = orchestrator.get_pipeline_stats(results)["cache"]
+            print(f"\n⏱️  {label}: {elapsed:.2f}s | "
+                  f"LLM hit rate {cache['llm']['hit_rate']:.0%} | "
+                  f"TTS hit rate {cache['tts']['hit_rate']:.0%}")
+
+
+async def benchmark_tts_batch(args: argparse.Namespace) -> None:
+    """Compare one TTS round trip per prompt with micro-batched TTS calls."""
+    prompts = [f"topic number {i}" for i in range(args.prompts)]
+
+    for label, batch_size in (("per-prompt TTS calls", 0), ("micro-batched TTS", args.tts_batch_size)):
+        # One simulated worker, like a workersMax=1 endpoint
+        tts_service = StubTTSAudioGenerator(
+            latency_s=args.tts_latency, per_char_latency_s=args.tts_char_latency, workers=1
+        )
+        batcher = None
+        if batch_size:
+            batcher = TTSMicroBatcher(
+                tts_service, max_batch_size=batch_size, max_wait_s=args.window_ms / 1000
+            )
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            orchestrator = LLMToTTSOrchestrator(
+                StubLLMTextGenerator(latency_s=args.llm_latency),
+                batcher or tts_service,
+                output_dir=output_dir,
+            )
+
+            start = time.perf_counter()
+            results = await orchestrator.process_batch(
+                prompts,
+                pipelined=True,
+                llm_concurrency=args.prompts,
+                tts_concurrency=args.prompts,
+            )
+            elapsed = time.perf_counter() - start
+            await orchestrator.close()
+
+        successful = sum(1 for r in results if r.get("success"))
+        print(f"\n⏱️  {label}: {elapsed:.2f}s for {successful}/{len(prompts)} prompts, "
+              f"{tts_service.calls} TTS round trips")
+        if batcher:
+            print(f"   mean batch size {batcher.stats()['mean_batch_size']:.1f}")
+
+
+async def benchmark_llm_batch(args: argparse.Namespace) -> None:
+    """Compare sequential and batched generation on a real model, in-process."""
+    from llm_service import LLMTextGenerator
+
+    # The @remote wrapper keeps the undecorated class, which lets the model
+    # run locally on CPU instead of on a remote worker
+    local_class = LLMTextGenerator(model_name=args.model)._class_type
+    generator = local_class(model_name=args.model, device_map="cpu")
+
+    prompts = [f"Give one tip about topic number {i}" for i in range(args.prompts)]
+
+    start = time.perf_counter()
+    sequential = [generator.generate_text(p, args.max_new_tokens) for p in prompts]
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = generator.generate_texts(prompts, args.max_new_tokens, args.max_batch_tokens)
+    batched_time = time.perf_counter() - start
+
+    matches = sum(
+        1 for s, b in zip(sequential, batched)
+        if s.get("generated_text") == b.get("generated_text")
+    )
+    for s, b in list(zip(sequential, batched))[:3]:
+        print(f"\n   sequential: {s.get('generated_text', s.get('error'))!r}")
+        print(f"   batched:    {b.get('generated_text', b.get('error'))!r}")
+
+    print(f"\n⏱️  sequential: {sequential_time:.2f}s ({len(prompts) / sequential_time:.2f} prompts/s)")
+    print(f"⏱️  batched:    {batched_time:.2f}s ({len(prompts) / batched_time:.2f} prompts/s)")
+    print(f"🔍 Identical outputs: {matches}/{len(prompts)}")
+
+
+async def benchmark_codecs(args: argparse.Namespace) -> None:
+    """Measure payload size and encode time per transport codec on a synthetic waveform."""
+    import math
+    import torch
+    import torchaudio as ta
+    from tts_service import TTSAudioGenerator
+
+    # The @remote wrapper keeps the undecorated class; its encoder needs no model
+    encode_audio = TTSAudioGenerator()._class_type._encode_audio
+
+    # Speech-like test signal: a few harmonics with a syllable-rate envelope
+    t = torch.arange(int(args.seconds * args.sample_rate)) / args.sample_rate
+    envelope = 0.5 * (1 + torch.sin(2 * math.pi * 4 * t))
+    wav = sum(torch.sin(2 * math.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 720, 1440)))
+    wav = (0.3 * envelope * wav + 0.01 * torch.randn_like(t)).unsqueeze(0)
+
+    print(f"\n{'codec':<8} {'rate':>6} {'bytes':>10} {'ratio':>6} {'encode':>9}")
+    baseline = None
+    for sample_rate in (args.sample_rate, args.downsample_rate):
+        signal = wav
+        if sample_rate != args.sample_rate:
+            signal = ta.functional.resample(wav, args.sample_rate, sample_rate)
+
+        for codec in ("wav", "pcm16", "flac", "opus"):
+            audio_data, info, encode_time_s = encode_audio(signal, sample_rate, codec)
+            baseline = baseline or len(audio_data)
+            print(f"{info['codec']:<8} {sample_rate:>6} {len(audio_data):>10,} "
+                  f"{baseline / len(audio_data):>5.1f}x {encode_time_s * 1000:>7.1f}ms")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM to TTS pipeline locally")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    batch = subparsers.add_parser("batch", help="Sequential vs pipelined batch processing")
+    batch.add_argument("--prompts", type=int, default=8)
+    batch.add_argument("--llm-latency", type=float, default=0.2)
+    batch.add_argument("--tts-latency", type=float, default=0.2)
+    batch.add_argument("--llm-concurrency", type=int, default=1)
+    batch.add_argument("--tts-concurrency", type=int, default=1)
+    batch.add_argument("--llm-batch-size", type=int, default=4)
+    batch.set_defaults(func=benchmark_batch)
+
+    ttfa = subparsers.add_parser("ttfa", help="Time-to-first-audio, streaming vs non-streaming")
+    ttfa.add_argument("--llm-latency", type=float, default=1.0)
+    ttfa.add_argument("--tts-latency", type=float, default=0.1)
+    ttfa.add_argument("--tts-char-latency", type=float, default=0.005)
+    ttfa.set_defaults(func=benchmark_ttfa)
+
+    cache = subparsers.add_parser("cache", help="Cold vs warm runs through the stage cache")
+    cache.add_argument("--prompts", type=int, default=10)
+    cache.add_argument("--repeat-ratio", type=float, default=0.3)
+    cache.add_argument("--llm-latency", type=float, default=0.2)
+    cache.add_argument("--tts-latency", type=float, default=0.2)
+    cache.set_defaults(func=benchmark_cache)
+
+    tts_batch = subparsers.add_parser(
+        "tts-batch", help="Per-prompt vs micro-batched TTS calls to a single worker"
+    )
+    tts_batch.add_argument("--prompts", type=int, default=32)
+    tts_batch.add_argument("--llm-latency", type=float, default=0.2)
+    tts_batch.add_argument("--tts-latency", type=float, default=0.2)
+    tts_batch.add_argument("--tts-char-latency", type=float, default=0.0005)
+    tts_batch.add_argument("--tts-batch-size", type=int, default=8)
+    tts_batch.add_argument("--window-ms", type=float, default=10.0)
+    tts_batch.set_defaults(func=benchmark_tts_batch)
+
+    codecs = subparsers.add_parser("codecs", help="Audio payload size and encode time per codec")
+    codecs.add_argument("--seconds", type=float, default=10.0)
+    codecs.add_argument("--sample-rate", type=int, default=24000)
+    codecs.add_argument("--downsample-rate", type=int, default=16000)
+    codecs.set_defaults(func=benchmark_codecs)
+
+    llm_batch = subparsers.add_parser(
+        "llm-batch", help="Sequential vs batched generation with a local CPU model"
+    )
+    llm_batch.add_argument("--model", default="HuggingFaceTB/SmolLM2-135M-Instruct")
+    llm_batch.add_argument("--prompts", type=int, default=8)
+    llm_batch.add_argument("--max-new-tokens", type=int, default=32)
+    llm_batch.add_argument("--max-batch-tokens", type=int, default=16384)
+    llm_batch.set_defaults(func=benchmark_llm_batch)
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    asyncio.run(arguments.func(arguments))
@@ -7,6 +7,16 @@ Centralized configuration management for service settings.
 from tetra_rp import LiveServerless, GpuGroup
 
 
+# Generation settings. They are passed to the services and key the
+# orchestrator's stage cache, so a change here never serves stale results.
+LLM_MODEL_NAME = "Qwen/Qwen3-4B-Instruct-2507"
+LLM_SYSTEM_PROMPT = "You are an educator and motivational speaker. Answer just in 50 tokens."
+LLM_MAX_NEW_TOKENS = 50
+
+TTS_SAMPLE_RATE = 24000  # Delivered rate; Chatterbox generates at 24 kHz
+TTS_CODEC = "wav"  # Transport codec: wav, pcm16, flac or opus
+
+
 def get_llm_config() -> LiveServerless:
     """
     Get configuration for LLM text generation service.
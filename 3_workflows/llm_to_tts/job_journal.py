@@ -0,0 +1,96 @@
+"""
+Batch Job Journal
+
+Append-only JSONL log of per-prompt stage completions. Replaying it after a
+crash tells the orchestrator which prompts are already finished and which only
+need their TTS stage re-run, so long batches resume instead of starting over.
+"""
+
+from pathlib import Path
+from typing import Dict, Union
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+# Journal events, in the order a prompt moves through them
+LLM_DONE = "llm_done"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+class JobJournal:
+    """Durable, append-only record of batch progress."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open (or create) a journal file.
+
+        Args:
+            path: JSONL file to append events to
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_id_for(index: int, prompt: str) -> str:
+        """Derive a stable job ID from a prompt and its position in the input."""
+        return hashlib.sha256(f"{index}\n{prompt}".encode("utf-8")).hexdigest()[:16]
+
+    def load(self) -> Dict[str, dict]:
+        """
+        Replay the journal into the latest known state of each job.
+
+        Returns:
+            Mapping of job ID to ``{"llm_result": ..., "result": ...}``; either
+            key is present only once that stage has completed
+        """
+        jobs: Dict[str, dict] = {}
+        if not self.path.exists():
+            return jobs
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a partially written last line
+                    continue
+
+                job = jobs.setdefault(event["job_id"], {})
+                if event["event"] == LLM_DONE:
+                    job["llm_result"] = event["llm_result"]
+                elif event["event"] == COMPLETED:
+                    job["result"] = event["result"]
+                elif event["event"] == FAILED:
+                    job.pop("result", None)
+
+        return jobs
+
+    async def append(self, job_id: str, event: str, **fields) -> None:
+        """Durably append one event without blocking the event loop."""
+        record = {
+            "job_id": job_id,
+            "event": event,
+            "time": datetime.now().isoformat(),
+            **fields,
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        await asyncio.to_thread(self._append_line, line)
+
+    def _append_line(self, line: str) -> None:
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    @staticmethod
+    def is_durable(result: dict) -> bool:
+        """Check that every file a completed job saved is present on disk."""
+        saved_files = result.get("saved_files", {})
+        paths = [saved_files.get("text_file"), saved_files.get("audio_file")]
+        return all(path and Path(path).exists() for path in paths)
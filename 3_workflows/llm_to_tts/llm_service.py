@@ -18,18 +18,37 @@ from config import get_llm_config
 class LLMTextGenerator:
     """LLM service for generating text content using Qwen3-4B-Instruct model."""
 
-    def __init__(self) -> None:
-        """Initialize the LLM text generation with Qwen model."""
+    def __init__(
+        self,
+        model_name: str = "Qwen/Qwen3-4B-Instruct-2507",
+        device_map: str = "auto",
+        system_prompt: str = "You are an educator and motivational speaker. Answer just in 50 tokens.",
+    ) -> None:
+        """
+        Initialize the LLM text generation with Qwen model.
+
+        Args:
+            model_name: Hugging Face chat model to load
+            device_map: Device placement passed to ``from_pretrained``
+            system_prompt: System message prepended to every prompt
+        """
         from transformers import AutoModelForCausalLM, AutoTokenizer
 
-        model_name = "Qwen/Qwen3-4B-Instruct-2507"
+        self.model_name = model_name
+        self.system_prompt = system_prompt
 
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
         self.model = AutoModelForCausalLM.from_pretrained(
-            model_name, torch_dtype="auto", device_map="auto"
+            model_name, torch_dtype="auto", device_map=device_map
         )
 
-        print("LLM Text Generator initialized with Qwen3-4B-Instruct on A100")
+        # Batched generation needs left padding so every prompt ends at the
+        # same position and new tokens are appended right after it
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        print(f"LLM Text Generator initialized with {model_name}")
 
     def generate_text(self, prompt: str, max_new_tokens: int = 50):
         """
@@ -45,19 +64,7 @@ class LLMTextGenerator:
         print(f"Generating text for: '{prompt[:50]}...'")
 
         try:
-            messages = [
-                {
-                    "role": "system",
-                    "content": "You are an educator and motivational speaker. Answer just in 50 tokens.",
-                },
-                {"role": "user", "content": prompt},
-            ]
-
-            text = self.tokenizer.apply_chat_template(
-                messages,
-                tokenize=False,
-                add_generation_prompt=True,
-            )
+            text = self._build_chat_text(prompt)
             model_inputs = self.tokenizer([text], return_tensors="pt").to(
                 self.model.device
             )
@@ -68,25 +75,125 @@ class LLMTextGenerator:
             output_ids = generated_ids[0][len(model_inputs.input_ids[0]) :].tolist()
 
             generated_text = self.tokenizer.decode(output_ids, skip_special_tokens=True)
-            word_count = len(generated_text.split())
+            tokens_generated = sum(
+                1 for token_id in output_ids if token_id != self.tokenizer.pad_token_id
+            )
 
             print(f"Generated text: {generated_text[:100]}...")
 
-            return {
-                "original_prompt": prompt,
-                "generated_text": generated_text,
-                "text_length": len(generated_text),
-                "word_count": word_count,
-                "service": "llm_generator",
-                "gpu_type": "A100",
-                "success": True,
-            }
+            return self._build_result(prompt, generated_text, tokens_generated)
 
         except Exception as e:
             print(f"Error in text generation: {str(e)}")
-            return {
-                "error": str(e),
-                "original_prompt": prompt,
-                "service": "llm_generator",
-                "success": False,
-            }
+            return self._build_error(prompt, e)
+
+    def generate_texts(
+        self,
+        prompts: list,
+        max_new_tokens: int = 50,
+        max_batch_tokens: int = 16384,
+    ):
+        """
+        Generate text content for many prompts with batched ``generate`` calls.
+
+        Prompts are sorted by length and split into sub-batches whose padded
+        size, including the tokens still to be generated, fits the token budget.
+
+        Args:
+            prompts: Input text prompts for generation
+            max_new_tokens: Maximum number of tokens to generate per prompt
+            max_batch_tokens: Token budget per sub-batch
+                (batch size x (longest prompt + max_new_tokens))
+
+        Returns:
+            List of result dictionaries in the same shape as ``generate_text``,
+            in input order
+        """
+        print(f"Batch generating text for {len(prompts)} prompts...")
+
+        texts = [self._build_chat_text(prompt) for prompt in prompts]
+        lengths = [len(ids) for ids in self.tokenizer(texts)["input_ids"]]
+
+        # Group similarly sized prompts together to minimize padding
+        order = sorted(range(len(prompts)), key=lambda i: lengths[i])
+        batches = []
+        current = []
+        for i in order:
+            padded_tokens = (len(current) + 1) * (lengths[i] + max_new_tokens)
+            if current and padded_tokens > max_batch_tokens:
+                batches.append(current)
+                current = []
+            current.append(i)
+        if current:
+            batches.append(current)
+
+        results = [None] * len(prompts)
+        for batch in batches:
+            try:
+                model_inputs = self.tokenizer(
+                    [texts[i] for i in batch], return_tensors="pt", padding=True
+                ).to(self.model.device)
+
+                generated_ids = self.model.generate(
+                    **model_inputs,
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=self.tokenizer.pad_token_id,
+                )
+                output_ids = generated_ids[:, model_inputs.input_ids.shape[1] :]
+                generated_texts = self.tokenizer.batch_decode(
+                    output_ids, skip_special_tokens=True
+                )
+
+                token_counts = (
+                    (output_ids != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+                )
+
+                for i, generated_text, tokens_generated in zip(
+                    batch, generated_texts, token_counts
+                ):
+                    results[i] = self._build_result(
+                        prompts[i], generated_text, tokens_generated
+                    )
+
+            except Exception as e:
+                print(f"Error in batch text generation: {str(e)}")
+                for i in batch:
+                    results[i] = self._build_error(prompts[i], e)
+
+        print(f"Generated {len(prompts)} texts in {len(batches)} sub-batches")
+        return results
+
+    def _build_chat_text(self, prompt: str) -> str:
+        """Apply the chat template to a prompt with the service's system prompt."""
+        messages = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+        return self.tokenizer.apply_chat_template(
+            messages,
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+
+    def _build_result(self, prompt: str, generated_text: str, tokens_generated: int):
+        """Build the success result for a generated text."""
+        return {
+            "original_prompt": prompt,
+            "generated_text": generated_text,
+            "text_length": len(generated_text),
+            "word_count": len(generated_text.split()),
+            "tokens_generated": tokens_generated,
+            "service": "llm_generator",
+            "gpu_type": "A100",
+            "success": True,
+        }
+
+    def _build_error(self, prompt: str, error: Exception):
+        """Build the error result for a failed generation."""
+        return {
+            "error": str(error),
+            "original_prompt": prompt,
+            "service": "llm_generator",
+            "success": False,
+        }
@@ -14,21 +14,46 @@ Input Prompt → LLM Generation → Text Processing → TTS Synthesis → Audio
 USAGE:
 Run this script to see the complete pipeline in action with example prompts.
 Results are saved locally with timestamped files for easy access.
+Pass --prompts with a JSONL file of {"prompt": ..., "id": ...} objects to run
+your own batch. Add --journal to record progress, so re-running the same
+command after a crash skips prompts that already finished.
 
 REQUIREMENTS:
 - Tetra library installed
 - Local storage for output files
 """
 
+import argparse
 import asyncio
+import json
 
+from config import LLM_MODEL_NAME, LLM_SYSTEM_PROMPT
 from llm_service import LLMTextGenerator
 from tts_service import TTSAudioGenerator
 from orchestrator import LLMToTTSOrchestrator
 
 
+def load_prompts(path: str) -> tuple:
+    """Read prompts and optional job IDs from a JSONL file."""
+    prompts, job_ids = [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            prompts.append(record["prompt"])
+            job_ids.append(str(record.get("id", index)))
+    return prompts, job_ids
+
+
 async def main() -> None:
     """Main execution function demonstrating the complete pipeline."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--prompts", help="JSONL file of prompts (default: demo prompts)")
+    parser.add_argument("--journal",
+                        help="Job journal used to resume interrupted runs (default: none)")
+    args = parser.parse_args()
+    
     print("🎯 LLM to TTS Pipeline with Tetra")
     print("=" * 60)
     print("📋 Pipeline Architecture:")
@@ -39,7 +64,9 @@ async def main() -> None:
     
     # Initialize services
     print("🔧 Initializing services...")
-    llm_service = LLMTextGenerator()
+    llm_service = LLMTextGenerator(
+        model_name=LLM_MODEL_NAME, system_prompt=LLM_SYSTEM_PROMPT
+    )
     tts_service = TTSAudioGenerator()
     
     # Create orchestrator
@@ -52,11 +79,21 @@ async def main() -> None:
         "Tell me an inspiring story about space exploration",
         "Describe the benefits of reading books for personal growth",
     ]
+    job_ids = None
+    if args.prompts:
+        demo_prompts, job_ids = load_prompts(args.prompts)
     
     print(f"\n🎬 Running {len(demo_prompts)} pipeline demonstrations...")
     
-    # Process prompts using orchestrator's batch method
-    results = await orchestrator.process_batch(demo_prompts)
+    # Process prompts using orchestrator's batch method; pipelining lets the
+    # LLM work on the next prompt while the TTS worker synthesizes this one
+    try:
+        results = await orchestrator.process_batch(
+            demo_prompts, pipelined=True, journal_path=args.journal, job_ids=job_ids
+        )
+    finally:
+        # Make sure queued result files reach disk even if the batch fails
+        await orchestrator.flush()
     
     # Generate and display summary statistics
     print("\n" + "=" * 60)
@@ -67,9 +104,21 @@ async def main() -> None:
     
     print(f"✅ Successful runs: {stats['successful_runs']}/{stats['total_prompts']}")
     print(f"📈 Success rate: {stats['success_rate']:.1%}")
+    print(f"♻️  Resumed from journal: {sum(1 for r in results if r.get('resumed'))}")
     print(f"📝 Total words generated: {stats['total_words_generated']:,}")
     print(f"🎵 Audio files created: {stats['successful_runs']}")
     print(f"📁 Results saved in: {stats['output_directory']}")
+    for stage, cache_stats in stats["cache"].items():
+        print(f"💾 {stage.upper()} cache: {cache_stats['hits']} hits, "
+              f"{cache_stats['misses']} misses")
+    for stage, stage_stats in stats["stages"].items():
+        latency = stage_stats["latency_s"]
+        print(f"⏱️  {stage}: p50 {latency['p50']:.2f}s | p95 {latency['p95']:.2f}s | "
+              f"p99 {latency['p99']:.2f}s | {stage_stats['bytes_transferred']:,} bytes")
+    
+    metrics_files = await orchestrator.export_metrics()
+    print(f"📈 Metrics exported to: {metrics_files['json']} and {metrics_files['prometheus']}")
+    await orchestrator.close()
     
     if stats['successful_runs'] > 0:
         print("\n🎧 Play your generated audio files from:")
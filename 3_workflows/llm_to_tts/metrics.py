@@ -0,0 +1,154 @@
+"""
+Pipeline Metrics
+
+Records per-stage call timings, payload sizes and throughput units (generated
+tokens, seconds of audio) and summarizes them as latency percentiles and
+throughput. Summaries can be exported as JSON or in the Prometheus text format.
+"""
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Optional, Sequence
+import json
+import math
+
+# Histogram bucket upper bounds in seconds for Prometheus export
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class PipelineMetrics:
+    """Collects stage timings for the LLM to TTS pipeline."""
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, max_calls: Optional[int] = None
+    ) -> None:
+        """
+        Initialize an empty metrics collector.
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds
+            max_calls: Keep only the most recent calls per stage, so long runs
+                use constant memory; unbounded by default
+        """
+        if max_calls is not None and max_calls < 1:
+            raise ValueError("max_calls must be at least 1")
+        self.buckets = tuple(sorted(buckets))
+        self._calls: Dict[str, Deque[dict]] = defaultdict(lambda: deque(maxlen=max_calls))
+
+    def record(
+        self,
+        stage: str,
+        started_at: float,
+        finished_at: float,
+        items: int = 1,
+        bytes_transferred: int = 0,
+        tokens: int = 0,
+        audio_seconds: float = 0.0,
+    ) -> None:
+        """
+        Record one stage call.
+
+        Args:
+            stage: Stage name, e.g. ``llm``, ``tts`` or ``save``
+            started_at: ``time.perf_counter()`` value when the call started
+            finished_at: ``time.perf_counter()`` value when the call finished
+            items: Prompts handled by the call (more than one for batched calls)
+            bytes_transferred: Payload size produced by the call
+            tokens: Tokens generated by the call
+            audio_seconds: Seconds of audio produced by the call
+        """
+        self._calls[stage].append({
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "items": items,
+            "bytes": bytes_transferred,
+            "tokens": tokens,
+            "audio_seconds": audio_seconds,
+        })
+
+    def summary(self) -> dict:
+        """Summarize every stage's latency percentiles, volume and throughput."""
+        return {stage: self._summarize(calls) for stage, calls in self._calls.items()}
+
+    def to_json(self) -> str:
+        """Return the summary as a JSON document."""
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self, prefix: str = "llm_tts") -> str:
+        """Return stage latency histograms and counters in Prometheus text format."""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Duration of pipeline stage calls",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        for stage, calls in self._calls.items():
+            durations = [c["finished_at"] - c["started_at"] for c in calls]
+            for bound in self.buckets:
+                count = sum(1 for d in durations if d <= bound)
+                lines.append(
+                    f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}'
+                )
+            lines.append(
+                f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {len(durations)}'
+            )
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {sum(durations)}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {len(durations)}')
+
+        counters = (
+            ("items", "items", "Prompts handled by pipeline stages"),
+            ("bytes", "bytes", "Payload bytes produced by pipeline stages"),
+            ("tokens", "tokens", "Tokens generated by pipeline stages"),
+            ("audio_seconds", "audio_seconds", "Seconds of audio produced by pipeline stages"),
+        )
+        for field, name, help_text in counters:
+            lines.append(f"# HELP {prefix}_stage_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_stage_{name}_total counter")
+            for stage, calls in self._calls.items():
+                total = sum(c[field] for c in calls)
+                lines.append(f'{prefix}_stage_{name}_total{{stage="{stage}"}} {total}')
+
+        return "\n".join(lines) + "\n"
+
+    def _summarize(self, calls: Sequence[dict]) -> dict:
+        durations = sorted(c["finished_at"] - c["started_at"] for c in calls)
+        busy_s = _busy_time(calls)
+        tokens = sum(c["tokens"] for c in calls)
+        audio_seconds = sum(c["audio_seconds"] for c in calls)
+
+        return {
+            "calls": len(calls),
+            "items": sum(c["items"] for c in calls),
+            "latency_s": {
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+                "p99": _percentile(durations, 99),
+                "mean": sum(durations) / len(durations),
+                "max": durations[-1],
+            },
+            "busy_time_s": busy_s,
+            "bytes_transferred": sum(c["bytes"] for c in calls),
+            "tokens": tokens,
+            "tokens_per_s": tokens / busy_s if busy_s else 0.0,
+            "audio_seconds": audio_seconds,
+            "audio_seconds_per_s": audio_seconds / busy_s if busy_s else 0.0,
+        }
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _busy_time(calls: Sequence[dict]) -> float:
+    """Wall-clock time during which at least one call of the stage was running."""
+    total = 0.0
+    current_start = current_end = None
+    for call in sorted(calls, key=lambda c: c["started_at"]):
+        if current_end is None or call["started_at"] > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = call["started_at"], call["finished_at"]
+        else:
+            current_end = max(current_end, call["finished_at"])
+    if current_end is not None:
+        total += current_end - current_start
+    return total
@@ -6,12 +6,31 @@ Manages local storage, error handling, and provides a clean interface for pipeli
 """
 
 from pathlib import Path
-from typing import List
-import json
+from typing import AsyncIterator, Awaitable, Iterable, List, Optional, Tuple
+import asyncio
+import inspect
+import time
+import uuid
 from datetime import datetime
 
+from config import (
+    LLM_MAX_NEW_TOKENS,
+    LLM_MODEL_NAME,
+    LLM_SYSTEM_PROMPT,
+    TTS_CODEC,
+    TTS_SAMPLE_RATE,
+)
 from llm_service import LLMTextGenerator
 from tts_service import TTSAudioGenerator
+from job_journal import COMPLETED, FAILED, LLM_DONE, JobJournal
+from metrics import PipelineMetrics
+from result_writer import ResultWriter
+from stage_cache import StageCache
+from text_chunking import SentenceChunker
+
+
+class _StageError(Exception):
+    """A pipeline stage reported failure in its result."""
 
 
 class LLMToTTSOrchestrator:
@@ -22,26 +41,60 @@ class LLMToTTSOrchestrator:
     manages local storage, and provides a complete text-to-speech workflow.
     """
     
-    def __init__(self, llm_service: LLMTextGenerator, tts_service: TTSAudioGenerator) -> None:
+    def __init__(
+        self,
+        llm_service: LLMTextGenerator,
+        tts_service: TTSAudioGenerator,
+        output_dir: str = "llm_tts_results",
+        use_cache: bool = True,
+        cache_dir: Optional[str] = None,
+        cache_namespace: str = "remote",
+        llm_cache_max_bytes: int = 64 * 1024 * 1024,
+        tts_cache_max_bytes: int = 2 * 1024 * 1024 * 1024,
+        max_pending_writes: int = 32,
+        metrics_window: Optional[int] = None,
+    ) -> None:
         """
         Initialize the pipeline orchestrator.
         
         Args:
             llm_service: Initialized LLM text generation service
             tts_service: Initialized TTS audio generation service
+            output_dir: Root directory for saved texts and audio
+            use_cache: Serve repeated LLM/TTS work from the on-disk stage cache;
+                set to False to bypass it entirely
+            cache_dir: Stage cache location, defaults to ``<output_dir>/cache``
+            cache_namespace: Recorded in every cache key. Local stand-ins such
+                as the stub services need their own (e.g. ``"stub"``), so their
+                results are never served to runs against the real services
+            llm_cache_max_bytes: Size limit of the LLM stage cache
+            tts_cache_max_bytes: Size limit of the TTS stage cache
+            max_pending_writes: Result files that may be queued for writing
+                before the pipeline waits on disk I/O
+            metrics_window: Keep only this many recent calls per stage for
+                the metrics summary, at least 1; unbounded by default
         """
         self.llm_service = llm_service
         self.tts_service = tts_service
+        self.cache_namespace = cache_namespace
+        
+        self._setup_output_directories(output_dir)
+        
+        self.use_cache = use_cache
+        cache_root = Path(cache_dir) if cache_dir else self.output_dir / "cache"
+        self.llm_cache = StageCache(cache_root / "llm", llm_cache_max_bytes)
+        self.tts_cache = StageCache(cache_root / "tts", tts_cache_max_bytes)
         
-        self._setup_output_directories()
+        self.metrics = PipelineMetrics(max_calls=metrics_window)
+        self.writer = ResultWriter(max_pending=max_pending_writes, metrics=self.metrics)
         
         print("LLM to TTS Pipeline Orchestrator initialized")
         print(f"Results directory: {self.output_dir.absolute()}")
     
-    def _setup_output_directories(self) -> None:
+    def _setup_output_directories(self, output_dir: str) -> None:
         """Create organized output directory structure."""
-        self.output_dir = Path("llm_tts_results")
-        self.output_dir.mkdir(exist_ok=True)
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         self.texts_dir = self.output_dir / "texts"
         self.audio_dir = self.output_dir / "audio"
@@ -60,20 +113,20 @@ class LLMToTTSOrchestrator:
             Complete pipeline result with file paths and metadata
         """
         print(f"\n🚀 Processing: '{prompt}'")
+        started_at = time.perf_counter()
         
         # Step 1: Generate text with LLM
         print("   📝 Step 1: Generating text content...")
-        llm_result = await self.llm_service.generate_text(prompt)
+        llm_result = await self._run_llm_stage(prompt)
         
         if not llm_result.get("success"):
             return self._create_error_result(f"LLM failed: {llm_result.get('error')}", prompt)
         
-        generated_text = llm_result["generated_text"]
         print(f"   ✅ Generated {llm_result['word_count']} words")
         
         # Step 2: Convert text to speech
         print("   🎵 Step 2: Converting to speech...")
-        tts_result = await self.tts_service.generate_audio(generated_text)
+        tts_result = await self._run_tts_stage(llm_result["generated_text"])
         
         if not tts_result.get("success"):
             return self._create_error_result(f"TTS failed: {tts_result.get('error')}", prompt)
@@ -82,10 +135,103 @@ class LLMToTTSOrchestrator:
         
         # Step 3: Save results locally
         print("   💾 Step 3: Saving results...")
-        text_file = self._save_text_result(llm_result, prompt)
-        audio_file = self._save_audio_result(tts_result, prompt)
+        result = await self._run_save_stage(prompt, llm_result, tts_result)
+        self.metrics.record("pipeline", started_at, time.perf_counter())
+        
+        saved_files = result["saved_files"]
+        print(f"   ✅ Saved: {Path(saved_files['text_file']).name} | {Path(saved_files['audio_file']).name}")
+        return result
+    
+    async def _run_llm_stage(self, prompt: str):
+        """Run the LLM stage for a single prompt, served from cache when possible."""
+        key = self._llm_cache_key(prompt)
+        cached = await self._cache_get(self.llm_cache, key)
+        if cached is not None:
+            return cached
         
-        result = {
+        started_at = time.perf_counter()
+        llm_result = await self.llm_service.generate_text(prompt, max_new_tokens=LLM_MAX_NEW_TOKENS)
+        self._record_llm_call(started_at, [llm_result])
+        
+        await self._cache_put(self.llm_cache, key, llm_result)
+        return llm_result
+    
+    async def _run_tts_stage(self, text: str):
+        """Run the TTS stage for a single piece of generated text, served from cache when possible."""
+        key = self._tts_cache_key(text)
+        cached = await self._cache_get(self.tts_cache, key)
+        if cached is not None:
+            return cached
+        
+        started_at = time.perf_counter()
+        tts_result = await self.tts_service.generate_audio(
+            text, codec=TTS_CODEC, target_sample_rate=TTS_SAMPLE_RATE
+        )
+        self.metrics.record(
+            "tts",
+            started_at,
+            time.perf_counter(),
+            bytes_transferred=tts_result.get("file_size_bytes", 0),
+            audio_seconds=tts_result.get("duration_s", 0.0),
+        )
+        
+        await self._cache_put(self.tts_cache, key, tts_result)
+        return tts_result
+    
+    def _record_llm_call(self, started_at: float, llm_results: List[dict]) -> None:
+        """Record one LLM service call covering one or more prompts."""
+        self.metrics.record(
+            "llm",
+            started_at,
+            time.perf_counter(),
+            items=len(llm_results),
+            bytes_transferred=sum(
+                len(r.get("generated_text", "").encode("utf-8")) for r in llm_results
+            ),
+            tokens=sum(r.get("tokens_generated", 0) for r in llm_results),
+        )
+    
+    def _llm_cache_key(self, prompt: str) -> str:
+        # Built from the config the services are created with, not from the services
+        return StageCache.make_key(
+            prompt=prompt,
+            namespace=self.cache_namespace,
+            model_name=LLM_MODEL_NAME,
+            system_prompt=LLM_SYSTEM_PROMPT,
+            max_new_tokens=LLM_MAX_NEW_TOKENS,
+        )
+    
+    def _tts_cache_key(self, text: str) -> str:
+        return StageCache.make_key(
+            text=text,
+            namespace=self.cache_namespace,
+            sample_rate=TTS_SAMPLE_RATE,
+            codec=TTS_CODEC,
+        )
+    
+    async def _cache_get(self, cache: StageCache, key: str):
+        """Look up a stage result off the event loop; None on a miss or when bypassed."""
+        if not self.use_cache:
+            return None
+        return await asyncio.to_thread(cache.get, key)
+    
+    async def _cache_put(self, cache: StageCache, key: str, result) -> None:
+        """Store a successful stage result off the event loop."""
+        if self.use_cache and result.get("success"):
+            await asyncio.to_thread(cache.put, key, result)
+    
+    async def _run_save_stage(
+        self, prompt: str, llm_result, tts_result, writes: Optional[List[asyncio.Future]] = None
+    ):
+        """Queue both stage results for saving and build the final pipeline result."""
+        result_id = uuid.uuid4().hex[:12]
+        
+        # The writer times each file as it reaches disk, as the "save" stage
+        text_file = await self._save_text_result(llm_result, prompt, result_id, writes)
+        audio_file = await self._save_audio_result(tts_result, prompt, result_id, writes=writes)
+        
+        return {
+            "result_id": result_id,
             "prompt": prompt,
             "llm_result": llm_result,
             "tts_result": tts_result,
@@ -96,20 +242,209 @@ class LLMToTTSOrchestrator:
             "success": True,
             "timestamp": datetime.now().isoformat()
         }
+    
+    async def process_prompt_streaming(self, prompt: str, tts_concurrency: int = 1):
+        """
+        Execute the pipeline for a single prompt, streaming sentence by sentence.
         
-        print(f"   ✅ Saved: {Path(text_file).name} | {Path(audio_file).name}")
-        return result
+        Generated text is cut at sentence boundaries and each sentence goes to
+        TTS as soon as it is complete, so the first audio chunk is written long
+        before the whole answer has been synthesized. Chunks are saved in order.
+        
+        Args:
+            prompt: Input text prompt for processing
+            tts_concurrency: Maximum in-flight TTS calls for this prompt
+            
+        Returns:
+            Pipeline result with ordered audio chunk files and time-to-first-audio
+        """
+        print(f"\n🚀 Streaming: '{prompt}'")
+        start = time.perf_counter()
+        result_id = uuid.uuid4().hex[:12]
+        
+        tts_semaphore = asyncio.Semaphore(tts_concurrency)
+        chunk_tasks: asyncio.Queue = asyncio.Queue()
+        llm_output = {}
+        audio_files = []
+        tts_results = []
+        first_audio_at = None
+        
+        async def synthesize(sentence: str):
+            async with tts_semaphore:
+                return await self._run_tts_stage(sentence)
+        
+        async def produce_sentences():
+            chunker = SentenceChunker()
+            try:
+                async for delta in self._stream_llm_text(prompt, llm_output):
+                    for sentence in chunker.feed(delta):
+                        chunk_tasks.put_nowait(asyncio.ensure_future(synthesize(sentence)))
+                for sentence in chunker.flush():
+                    chunk_tasks.put_nowait(asyncio.ensure_future(synthesize(sentence)))
+            finally:
+                chunk_tasks.put_nowait(None)
+        
+        async def write_chunks():
+            nonlocal first_audio_at
+            while True:
+                task = await chunk_tasks.get()
+                if task is None:
+                    return
+                tts_result = await task
+                if not tts_result.get("success"):
+                    raise _StageError(f"TTS failed: {tts_result.get('error')}")
+                
+                audio_files.append(
+                    await self._save_audio_result(
+                        tts_result, prompt, result_id, chunk_index=len(audio_files)
+                    )
+                )
+                tts_results.append(tts_result)
+                if first_audio_at is None:
+                    first_audio_at = time.perf_counter() - start
+                    self.metrics.record("first_audio", start, start + first_audio_at)
+                    print(f"   🎵 First audio after {first_audio_at:.2f}s")
+        
+        producer = asyncio.ensure_future(produce_sentences())
+        writer = asyncio.ensure_future(write_chunks())
+        try:
+            await asyncio.gather(producer, writer)
+        except Exception as e:
+            producer.cancel()
+            writer.cancel()
+            while not chunk_tasks.empty():
+                task = chunk_tasks.get_nowait()
+                if task is not None:
+                    task.cancel()
+            error = str(e) if isinstance(e, _StageError) else f"Pipeline error: {str(e)}"
+            return self._create_error_result(error, prompt)
+        
+        llm_result = llm_output
+        generated_text = llm_result["generated_text"]
+        tts_result = {
+            "text": generated_text,
+            "chunk_count": len(tts_results),
+            "sample_rate": tts_results[0]["sample_rate"] if tts_results else None,
+            "file_size_bytes": sum(r["file_size_bytes"] for r in tts_results),
+            "service": "tts_generator",
+            "success": True,
+        }
+        text_file = await self._save_text_result(llm_result, prompt, result_id)
+        self.metrics.record("pipeline", start, time.perf_counter())
+        
+        print(f"   ✅ Saved {len(audio_files)} audio chunks")
+        return {
+            "result_id": result_id,
+            "prompt": prompt,
+            "llm_result": llm_result,
+            "tts_result": tts_result,
+            "saved_files": {
+                "text_file": text_file,
+                "audio_files": audio_files
+            },
+            "time_to_first_audio_s": first_audio_at,
+            "total_time_s": time.perf_counter() - start,
+            "success": True,
+            "timestamp": datetime.now().isoformat()
+        }
     
-    async def process_batch(self, prompts: List[str]):
+    async def _stream_llm_text(self, prompt: str, llm_output: dict) -> AsyncIterator[str]:
+        """
+        Yield generated text incrementally for a prompt, filling ``llm_output``
+        with the LLM result once the text is complete.
+        
+        Uses the service's ``stream_text`` async generator when it has one,
+        with the same stage cache and token limit as the non-streaming path;
+        a cached answer arrives as a single delta. Remote services answer each
+        call with one complete response, so for them the whole text arrives as
+        a single delta too; it is still cut into sentences so TTS can start on
+        the first one.
+        """
+        stream_text = getattr(self.llm_service, "stream_text", None)
+        if inspect.isasyncgenfunction(stream_text):
+            key = self._llm_cache_key(prompt)
+            cached = await self._cache_get(self.llm_cache, key)
+            if cached is not None:
+                llm_output.update(cached)
+                yield cached["generated_text"]
+                return
+            
+            started_at = time.perf_counter()
+            parts = []
+            async for delta in stream_text(prompt, max_new_tokens=LLM_MAX_NEW_TOKENS):
+                parts.append(delta)
+                yield delta
+            
+            generated_text = "".join(parts).strip()
+            llm_output.update({
+                "original_prompt": prompt,
+                "generated_text": generated_text,
+                "text_length": len(generated_text),
+                "word_count": len(generated_text.split()),
+                # Streamed deltas carry no service metadata, so no GPU type is reported
+                "service": "llm_generator",
+                "success": True,
+            })
+            self._record_llm_call(started_at, [llm_output])
+            await self._cache_put(self.llm_cache, key, dict(llm_output))
+            return
+        
+        llm_result = await self._run_llm_stage(prompt)
+        if not llm_result.get("success"):
+            raise _StageError(f"LLM failed: {llm_result.get('error')}")
+        
+        llm_output.update(llm_result)
+        yield llm_result["generated_text"]
+    
+    async def process_batch(
+        self,
+        prompts: List[str],
+        pipelined: bool = False,
+        llm_concurrency: int = 1,
+        tts_concurrency: int = 1,
+        llm_batch_size: int = 1,
+        journal_path: Optional[str] = None,
+        job_ids: Optional[List[str]] = None,
+    ):
         """
         Process multiple prompts through the pipeline.
         
         Args:
             prompts: List of text prompts to process
+            pipelined: Overlap the LLM and TTS stages of different prompts
+                instead of running each prompt end to end
+            llm_concurrency: Maximum in-flight LLM calls in pipelined mode
+            tts_concurrency: Maximum in-flight TTS calls in pipelined mode
+            llm_batch_size: Prompts per batched ``generate_texts`` call in
+                pipelined mode
+            journal_path: JSONL job journal to resume from and append to, in
+                pipelined mode
+            job_ids: Stable IDs for the prompts in the journal
             
         Returns:
-            List of pipeline results for each prompt
+            List of pipeline results for each prompt, in input order
         """
+        if pipelined:
+            results = [
+                result
+                async for result in self.iter_batch(
+                    prompts,
+                    llm_concurrency=llm_concurrency,
+                    tts_concurrency=tts_concurrency,
+                    llm_batch_size=llm_batch_size,
+                    journal_path=journal_path,
+                    job_ids=job_ids,
+                    ordered=True,
+                )
+            ]
+            await self.flush()
+            return results
+        
+        if llm_batch_size != 1:
+            raise ValueError("llm_batch_size requires pipelined=True")
+        if journal_path:
+            raise ValueError("journal_path requires pipelined=True")
+        
         results = []
         
         for i, prompt in enumerate(prompts, 1):
@@ -122,8 +457,273 @@ class LLMToTTSOrchestrator:
             else:
                 print(f"   ❌ Pipeline failed: {result.get('error')}")
         
+        await self.flush()
         return results
     
+    async def iter_batch(
+        self,
+        prompts: List[str],
+        llm_concurrency: int = 1,
+        tts_concurrency: int = 1,
+        llm_batch_size: int = 1,
+        journal_path: Optional[str] = None,
+        job_ids: Optional[List[str]] = None,
+        ordered: bool = True,
+    ) -> AsyncIterator[dict]:
+        """
+        Run prompts through a pipelined LLM → TTS flow and yield results.
+        
+        Each stage has its own concurrency limit, so while the TTS worker
+        synthesizes prompt N the LLM worker is already generating prompt N+1.
+        A failure in one prompt never affects the others.
+        
+        Args:
+            prompts: List of text prompts to process
+            llm_concurrency: Maximum in-flight LLM calls
+            tts_concurrency: Maximum in-flight TTS calls
+            llm_batch_size: Prompts per LLM call. Above 1, consecutive prompts
+                are generated together through ``generate_texts`` and each
+                moves on to TTS as soon as its batch is done
+            journal_path: Append-only JSONL job journal. Prompts it records as
+                completed, whose files are still on disk, are skipped; prompts
+                with only generated text resume at the TTS stage
+            job_ids: Stable per-prompt IDs for the journal; derived from each
+                prompt and its position when omitted
+            ordered: Yield results in input order; otherwise yield them as
+                soon as each prompt completes
+            
+        Yields:
+            Pipeline results tagged with their ``prompt_index``
+        """
+        if llm_concurrency < 1 or tts_concurrency < 1:
+            raise ValueError("Stage concurrency limits must be at least 1")
+        if llm_batch_size < 1:
+            raise ValueError("llm_batch_size must be at least 1")
+        
+        llm_semaphore = asyncio.Semaphore(llm_concurrency)
+        tts_semaphore = asyncio.Semaphore(tts_concurrency)
+        total = len(prompts)
+        
+        journal = JobJournal(journal_path) if journal_path else None
+        jobs = await asyncio.to_thread(journal.load) if journal else {}
+        if job_ids is None:
+            job_ids = [JobJournal.job_id_for(i, p) for i, p in enumerate(prompts)]
+        
+        completed = {}
+        resumed_llm = {}
+        for index, job_id in enumerate(job_ids):
+            job = jobs.get(job_id, {})
+            if "result" in job and JobJournal.is_durable(job["result"]):
+                completed[index] = job["result"]
+            elif "llm_result" in job:
+                resumed_llm[index] = job["llm_result"]
+        if journal:
+            print(f"♻️  Journal: {len(completed)} prompts already done, "
+                  f"{len(resumed_llm)} resuming at TTS")
+        
+        # Only prompts without a journaled LLM result go through the LLM stage
+        llm_batch_of = {}
+        llm_batches = []
+        if llm_batch_size > 1:
+            needs_llm = [i for i in range(total) if i not in completed and i not in resumed_llm]
+            for start in range(0, len(needs_llm), llm_batch_size):
+                chunk = needs_llm[start : start + llm_batch_size]
+                batch = asyncio.ensure_future(
+                    self._run_llm_batch_stage([prompts[i] for i in chunk], llm_semaphore)
+                )
+                llm_batches.append(batch)
+                for offset, index in enumerate(chunk):
+                    llm_batch_of[index] = (batch, offset)
+        
+        async def llm_stage(index: int, prompt: str):
+            if index in resumed_llm:
+                return resumed_llm[index]
+            if index in llm_batch_of:
+                batch, offset = llm_batch_of[index]
+                return (await batch)[offset]
+            async with llm_semaphore:
+                return await self._run_llm_stage(prompt)
+        
+        async def run(index: int, prompt: str):
+            if index in completed:
+                result = dict(completed[index], resumed=True)
+            else:
+                result = await self._process_prompt_pipelined(
+                    prompt,
+                    llm_stage(index, prompt),
+                    tts_semaphore,
+                    journal=journal,
+                    job_id=job_ids[index],
+                    llm_resumed=index in resumed_llm,
+                )
+            result["prompt_index"] = index
+            
+            if result.get("success"):
+                print(f"   ✅ [{index + 1}/{total}] Pipeline completed successfully")
+            else:
+                print(f"   ❌ [{index + 1}/{total}] Pipeline failed: {result.get('error')}")
+            return result
+        
+        print(f"\n📋 Pipelined batch of {total} prompts "
+              f"(LLM x{llm_concurrency}, TTS x{tts_concurrency})")
+        
+        tasks = [asyncio.ensure_future(run(i, p)) for i, p in enumerate(prompts)]
+        try:
+            if ordered:
+                for task in tasks:
+                    yield await task
+            else:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+        finally:
+            for task in tasks + llm_batches:
+                task.cancel()
+    
+    async def iter_stream(
+        self,
+        jobs: Iterable[Tuple[str, str]],
+        max_in_flight: int = 64,
+        llm_concurrency: int = 1,
+        tts_concurrency: int = 1,
+    ) -> AsyncIterator[dict]:
+        """
+        Run an unbounded stream of prompts through the pipeline.
+        
+        Unlike ``iter_batch``, prompts are pulled from ``jobs`` only as slots
+        free up, and yielded results carry no audio bytes, so memory use does
+        not grow with the number of prompts. A result is only yielded as
+        successful once its text and audio files are on disk, so a record of
+        it can be trusted when resuming.
+        
+        Args:
+            jobs: Iterable of ``(job_id, prompt)`` pairs, consumed lazily
+            max_in_flight: Prompts started but not yet yielded
+            llm_concurrency: Maximum in-flight LLM calls
+            tts_concurrency: Maximum in-flight TTS calls
+            
+        Yields:
+            Pipeline results, without ``audio_data``, tagged with their
+            ``job_id``, in completion order
+        """
+        if llm_concurrency < 1 or tts_concurrency < 1 or max_in_flight < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        
+        llm_semaphore = asyncio.Semaphore(llm_concurrency)
+        tts_semaphore = asyncio.Semaphore(tts_concurrency)
+        
+        async def llm_stage(prompt: str):
+            async with llm_semaphore:
+                return await self._run_llm_stage(prompt)
+        
+        async def run(job_id: str, prompt: str):
+            # Callers record yielded results as done, so only yield once the files are on disk
+            result = await self._process_prompt_pipelined(
+                prompt, llm_stage(prompt), tts_semaphore, wait_for_writes=True
+            )
+            result = self._without_audio(result)
+            result["job_id"] = job_id
+            return result
+        
+        jobs = iter(jobs)
+        exhausted = False
+        pending = set()
+        try:
+            while True:
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        job_id, prompt = next(jobs)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(run(job_id, prompt)))
+                
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _run_llm_batch_stage(self, prompts: List[str], llm_semaphore: asyncio.Semaphore):
+        """Run the LLM stage for several prompts in one batched call, skipping cached prompts."""
+        keys = [self._llm_cache_key(prompt) for prompt in prompts]
+        results = [await self._cache_get(self.llm_cache, key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if missing:
+            async with llm_semaphore:
+                started_at = time.perf_counter()
+                generated = await self.llm_service.generate_texts(
+                    [prompts[i] for i in missing], max_new_tokens=LLM_MAX_NEW_TOKENS
+                )
+                self._record_llm_call(started_at, generated)
+            for i, llm_result in zip(missing, generated):
+                results[i] = llm_result
+                await self._cache_put(self.llm_cache, keys[i], llm_result)
+        
+        return results
+    
+    async def _process_prompt_pipelined(
+        self,
+        prompt: str,
+        llm_stage: Awaitable[dict],
+        tts_semaphore: asyncio.Semaphore,
+        journal: Optional[JobJournal] = None,
+        job_id: str = "",
+        llm_resumed: bool = False,
+        wait_for_writes: bool = False,
+    ):
+        """
+        Run one prompt through the stages, holding the TTS slot only while it runs.
+        
+        With a journal, or with ``wait_for_writes``, a prompt only succeeds once
+        its result files are on disk; a failed write fails the prompt.
+        """
+        started_at = time.perf_counter()
+        writes: List[asyncio.Future] = []
+        try:
+            llm_result = await llm_stage
+            
+            if not llm_result.get("success"):
+                result = self._create_error_result(f"LLM failed: {llm_result.get('error')}", prompt)
+            else:
+                if journal and not llm_resumed:
+                    await journal.append(job_id, LLM_DONE, prompt=prompt, llm_result=llm_result)
+                
+                async with tts_semaphore:
+                    tts_result = await self._run_tts_stage(llm_result["generated_text"])
+                
+                if not tts_result.get("success"):
+                    result = self._create_error_result(f"TTS failed: {tts_result.get('error')}", prompt)
+                else:
+                    result = await self._run_save_stage(prompt, llm_result, tts_result, writes)
+                    self.metrics.record("pipeline", started_at, time.perf_counter())
+        
+        except Exception as e:
+            result = self._create_error_result(f"Pipeline error: {str(e)}", prompt)
+        
+        if (journal or wait_for_writes) and result.get("success") and writes:
+            done, _ = await asyncio.wait(writes)
+            errors = [str(w.exception()) for w in done if w.exception() is not None]
+            if errors:
+                result = self._create_error_result(f"Save failed: {errors[0]}", prompt)
+        
+        if journal:
+            if result.get("success"):
+                await journal.append(job_id, COMPLETED, result=self._without_audio(result))
+            else:
+                await journal.append(job_id, FAILED, prompt=prompt, error=result["error"])
+        return result
+    
+    def _without_audio(self, result: dict) -> dict:
+        """Copy of a pipeline result without audio bytes, safe to log or keep around."""
+        if "tts_result" not in result:
+            return dict(result)
+        tts_result = {k: v for k, v in result["tts_result"].items() if k != "audio_data"}
+        return dict(result, tts_result=tts_result)
+    
     def _create_error_result(self, error_message: str, prompt: str):
         """Create standardized error result."""
         return {
@@ -133,63 +733,96 @@ class LLMToTTSOrchestrator:
             "timestamp": datetime.now().isoformat()
         }
     
-    def _save_text_result(self, llm_result, prompt: str) -> str:
-        """Save generated text with metadata to JSON file."""
+    async def _save_text_result(
+        self,
+        llm_result,
+        prompt: str,
+        result_id: str,
+        writes: Optional[List[asyncio.Future]] = None,
+    ) -> str:
+        """Queue generated text with metadata for saving as a JSON file; its write joins ``writes``."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"text_{timestamp}.json"
+        filename = f"text_{timestamp}_{result_id}.json"
         filepath = self.texts_dir / filename
         
         text_data = {
+            "result_id": result_id,
             "timestamp": timestamp,
             "original_prompt": prompt,
             "generated_text": llm_result["generated_text"],
             "word_count": llm_result["word_count"],
             "text_length": llm_result["text_length"],
             "service_info": {
-                "service": llm_result["service"],
-                "gpu_type": llm_result["gpu_type"]
+                key: llm_result[key] for key in ("service", "gpu_type") if key in llm_result
             }
         }
         
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(text_data, f, indent=2, ensure_ascii=False)
+        write = await self.writer.write_json(filepath, text_data)
+        if writes is not None:
+            writes.append(write)
         
         return str(filepath)
     
-    def _save_audio_result(self, tts_result, prompt: str) -> str:
-        """Save generated audio file with metadata."""
+    async def _save_audio_result(
+        self,
+        tts_result,
+        prompt: str,
+        result_id: str,
+        chunk_index: Optional[int] = None,
+        writes: Optional[List[asyncio.Future]] = None,
+    ) -> str:
+        """Queue generated audio and its metadata for saving; their writes join ``writes``."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Create safe filename from prompt
         safe_prompt = "".join(c for c in prompt[:30] if c.isalnum() or c in (' ', '-', '_')).strip()
         safe_prompt = safe_prompt.replace(' ', '_') or "audio"
         
-        # Save WAV file
-        audio_filename = f"speech_{safe_prompt}_{timestamp}.wav"
+        # Streamed audio is saved as ordered parts
+        part = f"_part{chunk_index:03d}" if chunk_index is not None else ""
+        stem = f"{safe_prompt}_{timestamp}_{result_id}{part}"
+        
+        # Save the audio in whichever codec the TTS service delivered
+        extension = tts_result.get("file_extension", "wav")
+        audio_filename = f"speech_{stem}.{extension}"
         audio_filepath = self.audio_dir / audio_filename
         
-        with open(audio_filepath, "wb") as f:
-            f.write(tts_result["audio_data"])
+        audio_write = await self.writer.write_bytes(audio_filepath, tts_result["audio_data"])
         
         # Save metadata
-        metadata_filename = f"speech_info_{safe_prompt}_{timestamp}.json"
+        metadata_filename = f"speech_info_{stem}.json"
         metadata_filepath = self.audio_dir / metadata_filename
         
         audio_metadata = {
+            "result_id": result_id,
             "timestamp": timestamp,
             "original_prompt": prompt,
             "text_content": tts_result["text"],
             "sample_rate": tts_result["sample_rate"],
+            "codec": tts_result.get("codec", "wav"),
             "file_size_bytes": tts_result["file_size_bytes"],
             "audio_file": audio_filename,
+            "chunk_index": chunk_index,
             "service": tts_result["service"]
         }
         
-        with open(metadata_filepath, "w", encoding="utf-8") as f:
-            json.dump(audio_metadata, f, indent=2, ensure_ascii=False)
+        metadata_write = await self.writer.write_json(metadata_filepath, audio_metadata)
+        if writes is not None:
+            writes.extend([audio_write, metadata_write])
         
         return str(audio_filepath)
     
+    async def flush(self) -> None:
+        """Wait until every queued result file has been written to disk."""
+        await self.writer.flush()
+        if self.writer.errors:
+            print(f"⚠️  {len(self.writer.errors)} result files failed to save")
+    
+    async def close(self) -> None:
+        """Write every queued result file and stop the writer threads; call once when done."""
+        await self.flush()
+        await self.writer.close()
+    
     def get_pipeline_stats(self, results: List):
         """Generate summary statistics for pipeline execution."""
         successful_runs = [r for r in results if r.get("success")]
@@ -200,5 +833,26 @@ class LLMToTTSOrchestrator:
             "successful_runs": len(successful_runs),
             "success_rate": len(successful_runs) / len(results) if results else 0,
             "total_words_generated": total_words,
-            "output_directory": str(self.output_dir.absolute())
-        }
\ No newline at end of file
+            "output_directory": str(self.output_dir.absolute()),
+            "cache": {
+                "llm": self.llm_cache.stats(),
+                "tts": self.tts_cache.stats(),
+            },
+            "stages": self.metrics.summary()
+        }
+    
+    async def export_metrics(self) -> dict:
+        """
+        Write stage metrics as JSON and Prometheus text next to the results.
+        
+        Returns:
+            Paths of the written metrics files
+        """
+        json_path = self.output_dir / "metrics.json"
+        prometheus_path = self.output_dir / "metrics.prom"
+        
+        await self.writer.write_bytes(json_path, self.metrics.to_json().encode("utf-8"))
+        await self.writer.write_bytes(prometheus_path, self.metrics.to_prometheus().encode("utf-8"))
+        await self.writer.flush()
+        
+        return {"json": str(json_path), "prometheus": str(prometheus_path)}
\ No newline at end of file
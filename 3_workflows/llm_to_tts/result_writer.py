@@ -0,0 +1,118 @@
+"""
+Write-Behind Result Persistence
+
+Offloads result file writes to a thread pool so the async pipeline never blocks
+on disk I/O. Every file is written to a temporary name and renamed into place,
+so readers never see partial files. The number of pending writes is bounded;
+callers only wait when that limit is reached. Given a metrics collector, each
+file write is recorded as a ``save`` stage call, timed on the writer thread.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Set, Tuple, Union
+import asyncio
+import json
+import os
+import time
+
+from metrics import PipelineMetrics
+
+
+class ResultWriter:
+    """Bounded write-behind queue backed by a thread pool."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_pending: int = 32,
+        metrics: Optional[PipelineMetrics] = None,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            max_workers: Threads performing file writes
+            max_pending: Writes that may be queued or in flight before
+                ``write_*`` calls start waiting (backpressure)
+            metrics: Collector that each completed file write is recorded in
+        """
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self.errors: List[str] = []
+        self.bytes_written = 0
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="result-writer"
+        )
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: Set[asyncio.Future] = set()
+
+    async def write_bytes(self, path: Union[str, Path], data: bytes) -> asyncio.Future:
+        """
+        Queue a binary file write, waiting only if too many writes are pending.
+
+        Returns:
+            Future that resolves once the file is on disk
+        """
+        return await self._submit(Path(path), data)
+
+    async def write_json(self, path: Union[str, Path], obj) -> asyncio.Future:
+        """
+        Queue a JSON file write, waiting only if too many writes are pending.
+
+        Returns:
+            Future that resolves once the file is on disk
+        """
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+        return await self._submit(Path(path), data)
+
+    async def flush(self) -> None:
+        """Wait until every queued write has reached disk."""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Flush pending writes and stop the worker threads."""
+        await self.flush()
+        self._executor.shutdown(wait=True)
+
+    async def _submit(self, path: Path, data: bytes) -> asyncio.Future:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_atomic, path, data
+        )
+        self._pending.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: asyncio.Future) -> None:
+        self._pending.discard(future)
+        self._slots.release()
+
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"   ❌ Failed to save result file: {error}")
+            self.errors.append(str(error))
+        else:
+            # Recorded here, on the event loop, so metrics are never updated from two threads
+            started_at, finished_at, size = future.result()
+            self.bytes_written += size
+            if self.metrics is not None:
+                self.metrics.record("save", started_at, finished_at, bytes_transferred=size)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> Tuple[float, float, int]:
+        """Write data next to its destination, then rename it into place; returns timing and size."""
+        started_at = time.perf_counter()
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return started_at, time.perf_counter(), len(data)
@@ -0,0 +1,125 @@
+"""
+Content-Addressed Stage Cache
+
+On-disk cache for pipeline stage results. Entries are keyed by a hash of
+everything that determines a stage's output, and the least recently used
+entries are evicted once the cache grows past its size limit.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+
+
+class StageCache:
+    """Size-bounded LRU cache of one pipeline stage's results, stored on disk."""
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        """
+        Initialize the cache, indexing any entries left by previous runs.
+
+        Args:
+            directory: Directory holding this stage's cache entries
+            max_bytes: Total size the entries may occupy before eviction
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # key -> (size in bytes, last access time)
+        self._index: Dict[str, tuple] = {}
+        for path in self.directory.glob("*.pkl"):
+            stat = path.stat()
+            self._index[path.stem] = (stat.st_size, stat.st_mtime)
+        self._total_bytes = sum(size for size, _ in self._index.values())
+
+    @staticmethod
+    def make_key(**fields: Any) -> str:
+        """Hash the fields that determine a stage's output into a cache key."""
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached result for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index[key] = (self._index[key][0], now)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        """Store a result, evicting least recently used entries if needed."""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            previous = self._index.get(key)
+            if previous:
+                self._total_bytes -= previous[0]
+            self._index[key] = (len(data), time.time())
+            self._total_bytes += len(data)
+            self._evict()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "evictions": self.evictions,
+                "entries": len(self._index),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits. Caller holds the lock."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            del self._index[key]
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
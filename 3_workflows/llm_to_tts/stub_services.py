@@ -0,0 +1,176 @@
+"""
+Stub Services for Local Pipeline Runs
+
+Drop-in stand-ins for LLMTextGenerator and TTSAudioGenerator that sleep instead
+of calling remote GPUs. They return results in the same shape as the real
+services, so the orchestrator can be exercised and benchmarked locally.
+"""
+
+import asyncio
+import io
+import math
+import struct
+import wave
+
+
+class StubLLMTextGenerator:
+    """LLM stand-in that sleeps for a fixed time per call; each word counts as one token."""
+
+    def __init__(self, latency_s: float = 0.2, fail_on: str = "") -> None:
+        """
+        Initialize the stub LLM service.
+
+        Args:
+            latency_s: Simulated generation time per call in seconds
+            fail_on: Prompts containing this substring return an error result
+        """
+        self.latency_s = latency_s
+        self.fail_on = fail_on
+        self.calls = 0
+
+    async def generate_text(self, prompt: str, max_new_tokens: int = 50):
+        """Return a canned answer for the prompt after a simulated delay."""
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return self._result(prompt, max_new_tokens)
+
+    async def generate_texts(self, prompts: list, max_new_tokens: int = 50):
+        """Answer several prompts in one call; each extra prompt adds 10% latency."""
+        self.calls += 1
+        await asyncio.sleep(self.latency_s * (1 + 0.1 * (len(prompts) - 1)))
+        return [self._result(prompt, max_new_tokens) for prompt in prompts]
+
+    async def stream_text(self, prompt: str, max_new_tokens: int = 50):
+        """Yield the canned answer word by word, spreading the delay across words."""
+        self.calls += 1
+        words = self._answer(prompt, max_new_tokens).split(" ")
+
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("stub failure")
+
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.latency_s / len(words))
+            yield word if i == 0 else f" {word}"
+
+    def _result(self, prompt: str, max_new_tokens: int):
+        """Build a result dict in the same shape as LLMTextGenerator.generate_text."""
+        if self.fail_on and self.fail_on in prompt:
+            return {
+                "error": "stub failure",
+                "original_prompt": prompt,
+                "service": "llm_generator",
+                "success": False,
+            }
+
+        generated_text = self._answer(prompt, max_new_tokens)
+        return {
+            "original_prompt": prompt,
+            "generated_text": generated_text,
+            "text_length": len(generated_text),
+            "word_count": len(generated_text.split()),
+            "tokens_generated": len(generated_text.split()),
+            "service": "llm_generator",
+            "gpu_type": "stub",
+            "success": True,
+        }
+
+    def _answer(self, prompt: str, max_new_tokens: int) -> str:
+        """Build the canned multi-sentence answer for a prompt, cut to ``max_new_tokens`` words."""
+        answer = (
+            f"Here is a short answer about {prompt}. "
+            "It covers the key idea in a single sentence. "
+            "Then it adds a practical example to remember. "
+            "And it ends with a motivating thought!"
+        )
+        return " ".join(answer.split(" ")[:max_new_tokens])
+
+
+class StubTTSAudioGenerator:
+    """TTS stand-in that sleeps in proportion to text length and returns a tone."""
+
+    def __init__(
+        self,
+        latency_s: float = 0.2,
+        per_char_latency_s: float = 0.0,
+        sample_rate: int = 24000,
+        workers: int = 0,
+    ) -> None:
+        """
+        Initialize the stub TTS service.
+
+        Args:
+            latency_s: Fixed simulated synthesis time per call in seconds
+            per_char_latency_s: Additional simulated time per input character
+            sample_rate: Sample rate of the generated WAV data
+            workers: Calls served at once, like an endpoint's ``workersMax``;
+                0 serves every call concurrently
+        """
+        self.latency_s = latency_s
+        self.per_char_latency_s = per_char_latency_s
+        self.sample_rate = sample_rate
+        self.workers = workers
+        self.calls = 0
+        self._worker_slots = None
+
+    async def generate_audio(self, text: str, codec: str = "wav", target_sample_rate: int = 0):
+        """Return a short 16-bit WAV tone for the text after a simulated delay."""
+        self.calls += 1
+        await self._occupy_worker(self.latency_s + self.per_char_latency_s * len(text))
+        return self._result(text, target_sample_rate)
+
+    async def generate_audio_batch(
+        self, texts: list, codec: str = "wav", target_sample_rate: int = 0
+    ):
+        """Synthesize several texts in one call; the fixed latency is paid once."""
+        self.calls += 1
+        chars = sum(len(text) for text in texts)
+        await self._occupy_worker(self.latency_s + self.per_char_latency_s * chars)
+        return [self._result(text, target_sample_rate) for text in texts]
+
+    async def _occupy_worker(self, seconds: float) -> None:
+        """Sleep while holding one of the simulated workers, if they are limited."""
+        if not self.workers:
+            await asyncio.sleep(seconds)
+            return
+        if self._worker_slots is None:
+            self._worker_slots = asyncio.Semaphore(self.workers)
+        async with self._worker_slots:
+            await asyncio.sleep(seconds)
+
+    def _result(self, text: str, target_sample_rate: int):
+        """Build a result dict in the same shape as TTSAudioGenerator.generate_audio."""
+        sample_rate = target_sample_rate or self.sample_rate
+        duration_s = 0.05 * len(text.split())
+        audio_data = _sine_wav(duration_s, sample_rate)
+        return {
+            "text": text,
+            "audio_data": audio_data,
+            "sample_rate": sample_rate,
+            "duration_s": duration_s,
+            "file_size_bytes": len(audio_data),
+            "codec": "pcm16",
+            "file_extension": "wav",
+            "mime_type": "audio/wav",
+            "service": "tts_generator",
+            "success": True,
+        }
+
+
+def _sine_wav(duration_s: float, sample_rate: int) -> bytes:
+    """Build a mono 16-bit WAV containing a 440 Hz tone."""
+    n_samples = max(1, int(duration_s * sample_rate))
+    frames = struct.pack(
+        f"<{n_samples}h",
+        *(
+            int(8000 * math.sin(2 * math.pi * 440 * i / sample_rate))
+            for i in range(n_samples)
+        ),
+    )
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+    return buffer.getvalue()
@@ -0,0 +1,59 @@
+"""
+Sentence Chunking for Streaming TTS
+
+Cuts incrementally generated text at sentence boundaries so each sentence can be
+sent to the TTS service as soon as it is complete.
+"""
+
+import re
+from typing import List
+
+# A sentence ends with terminal punctuation, optional closing quotes/brackets,
+# followed by whitespace
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*\s+")
+
+
+class SentenceChunker:
+    """Accumulates text deltas and emits complete sentences."""
+
+    def __init__(self, min_chars: int = 20) -> None:
+        """
+        Initialize the chunker.
+
+        Args:
+            min_chars: Sentences shorter than this are merged with the next one,
+                so abbreviations and very short fragments don't become their
+                own TTS calls
+        """
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """
+        Add a text delta and return any sentences completed by it.
+
+        Args:
+            delta: Newly generated text
+
+        Returns:
+            Complete sentences, in order
+        """
+        self._buffer += delta
+        sentences = []
+        start = 0
+
+        for match in _SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start : match.end()].strip()
+            if len(candidate) < self.min_chars:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text remains once generation has finished."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return [remainder] if remainder else []
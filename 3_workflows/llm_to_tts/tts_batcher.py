@@ -0,0 +1,114 @@
+"""
+TTS Micro-Batching Dispatcher
+
+Coalesces concurrent ``generate_audio`` calls into batched remote calls. Calls
+that arrive within a short window, up to a maximum batch size, are sent as one
+``generate_audio_batch`` round trip and the results are handed back to each
+waiting caller. This trades a few milliseconds of queueing for far fewer round
+trips to a single-worker endpoint.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import asyncio
+
+
+class TTSMicroBatcher:
+    """Drop-in ``generate_audio`` front end that batches concurrent calls."""
+
+    def __init__(
+        self,
+        tts_service,
+        max_batch_size: int = 8,
+        max_wait_s: float = 0.01,
+        max_in_flight_batches: int = 1,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            tts_service: Service exposing ``generate_audio_batch``
+            max_batch_size: Calls sent together in one remote call
+            max_wait_s: How long the first call of a batch waits for others
+            max_in_flight_batches: Batched remote calls running at once
+        """
+        if max_batch_size < 1 or max_in_flight_batches < 1:
+            raise ValueError("Batch size and in-flight batches must be at least 1")
+
+        self.tts_service = tts_service
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_s
+        self.max_in_flight_batches = max_in_flight_batches
+
+        self.requests = 0
+        self.batches = 0
+
+        # (codec, sample rate) -> texts and futures waiting for the next batch
+        self._pending: Dict[Tuple[str, int], List[tuple]] = {}
+        self._timers: Dict[Tuple[str, int], asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def generate_audio(self, text: str, codec: str = "wav", target_sample_rate: int = 0):
+        """Queue one text for synthesis and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (codec, target_sample_rate)
+        self.requests += 1
+
+        batch = self._pending.setdefault(key, [])
+        batch.append((text, future))
+        if len(batch) >= self.max_batch_size:
+            self._dispatch(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.max_wait_s, self._dispatch, key)
+
+        return await future
+
+    def stats(self) -> dict:
+        """Return request and batch counters."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0,
+            "queued": sum(len(batch) for batch in self._pending.values()),
+        }
+
+    def _dispatch(self, key: Tuple[str, int]) -> None:
+        """Send everything queued under a key as one batched call."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if not batch:
+            return
+
+        self.batches += 1
+        task = asyncio.ensure_future(self._run_batch(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, key: Tuple[str, int], batch: List[tuple]) -> None:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight_batches)
+
+        codec, target_sample_rate = key
+        texts = [text for text, _ in batch]
+        try:
+            async with self._slots:
+                results = await self.tts_service.generate_audio_batch(
+                    texts, codec=codec, target_sample_rate=target_sample_rate
+                )
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batched TTS returned {len(results)} results for {len(batch)} texts"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -28,34 +28,43 @@ class TTSAudioGenerator:
         
         print("Chatterbox TTS model loaded successfully on RTX 4090!")
 
-    def generate_audio(self, text: str):
+    def generate_audio(self, text: str, codec: str = "wav", target_sample_rate: int = 0):
         """
         Generate audio from input text.
         
         Args:
             text: Input text to convert to speech
+            codec: Transport encoding: ``wav`` (float32), ``pcm16``, ``flac``
+                or ``opus``. Codecs the worker cannot encode fall back to the
+                next most compact one.
+            target_sample_rate: Resample to this rate before encoding;
+                0 keeps the model's native rate
             
         Returns:
-            Dictionary containing audio data and metadata
+            Dictionary containing audio data, codec metadata and timing
         """
         print(f"Generating audio for: '{text[:50]}...'")
         
         try:
             wav = self.model.generate(text)
             
-            buffer = self.io.BytesIO()
-            self.ta.save(buffer, wav, self.model.sr, format="wav")
-            buffer.seek(0)
+            sample_rate = self.model.sr
+            if target_sample_rate and target_sample_rate != sample_rate:
+                wav = self.ta.functional.resample(wav, sample_rate, target_sample_rate)
+                sample_rate = target_sample_rate
             
-            audio_data = buffer.getvalue()
+            audio_data, codec_info, encode_time_s = self._encode_audio(wav, sample_rate, codec)
             
-            print(f"Generated {len(audio_data)} bytes of audio data")
+            print(f"Generated {len(audio_data)} bytes of {codec_info['codec']} audio")
             
             return {
                 "text": text,
                 "audio_data": audio_data,
-                "sample_rate": self.model.sr,
+                "sample_rate": sample_rate,
+                "duration_s": wav.shape[-1] / sample_rate,
                 "file_size_bytes": len(audio_data),
+                "encode_time_s": encode_time_s,
+                **codec_info,
                 "service": "tts_generator",
                 "success": True
             }
@@ -69,6 +78,66 @@ class TTSAudioGenerator:
                 "success": False
             }
 
+    def generate_audio_batch(self, texts: list, codec: str = "wav", target_sample_rate: int = 0):
+        """
+        Generate audio for several texts in one remote call.
+        
+        Args:
+            texts: Input texts to convert to speech
+            codec: Transport encoding, as for ``generate_audio``
+            target_sample_rate: Resample rate, as for ``generate_audio``
+            
+        Returns:
+            One ``generate_audio`` result per text, in input order; a failing
+            text only fails its own result
+        """
+        print(f"Generating audio for a batch of {len(texts)} texts")
+        return [
+            self.generate_audio(text, codec=codec, target_sample_rate=target_sample_rate)
+            for text in texts
+        ]
+
+    @staticmethod
+    def _encode_audio(wav, sample_rate: int, codec: str):
+        """
+        Encode a waveform for transport, falling back to more widely supported codecs.
+        
+        Returns:
+            Tuple of (encoded bytes, codec metadata, encode time in seconds)
+        """
+        import io
+        import time
+        import torchaudio as ta
+        
+        codecs = {
+            "wav": ({"format": "wav"}, "wav", "audio/wav"),
+            "pcm16": ({"format": "wav", "encoding": "PCM_S", "bits_per_sample": 16}, "wav", "audio/wav"),
+            "flac": ({"format": "flac", "bits_per_sample": 16}, "flac", "audio/flac"),
+            "opus": ({"format": "ogg", "encoding": "OPUS"}, "ogg", "audio/ogg"),
+        }
+        fallbacks = {"opus": ["opus", "flac", "pcm16"], "flac": ["flac", "pcm16"]}
+        
+        if codec not in codecs:
+            raise ValueError(f"Unsupported codec '{codec}', expected one of {sorted(codecs)}")
+        
+        for candidate in fallbacks.get(codec, [codec]):
+            save_kwargs, extension, mime_type = codecs[candidate]
+            start = time.perf_counter()
+            try:
+                buffer = io.BytesIO()
+                ta.save(buffer, wav, sample_rate, **save_kwargs)
+            except Exception as e:
+                print(f"Codec '{candidate}' unavailable ({e}), trying a fallback")
+                continue
+            
+            return buffer.getvalue(), {
+                "codec": candidate,
+                "file_extension": extension,
+                "mime_type": mime_type,
+            }, time.perf_counter() - start
+        
+        raise RuntimeError(f"No available encoder for codec '{codec}'")
+
     def get_model_info(self):
         """Get information about the loaded TTS model."""
         return {
@@ -0,0 +1,139 @@
+"""
+Cold-Start Phase Profiler
+
+Breaks down how long it takes a class-based ``@remote`` service to become
+ready. SimpleSD, MinimalVLLM, OpenAIGPTOSSInference and ChatterboxTTSInference
+time their own startup phases while they are created. Those phases are imports,
+model download (or cache hit), weight load, device transfer and optional
+warmup. Only SimpleSD times the last three apart. vLLM, ``transformers``
+pipelines and Chatterbox download, load and place weights in one call, so
+their single ``load_to_device_s`` phase covers all three, and the report lists
+it under ``combined_phases``. ``process_age_s`` is how long the worker process
+had been running when ``__init__`` began. It is not a measure of worker boot or
+dependency install: on a reused worker it is the worker's whole lifetime. The
+report is logged on the worker and returned by ``get_startup_report()``.
+
+``profile_init`` wraps any class's ``__init__`` locally. It adds the time spent
+importing modules for the first time, which works for classes that do not
+report their own phases too.
+
+USAGE:
+    python benchmarks/cold_start.py vllm --fake
+    python benchmarks/cold_start.py gpt-oss --model HuggingFaceTB/SmolLM2-135M-Instruct --warmup
+    python benchmarks/cold_start.py sd --remote
+"""
+
+from pathlib import Path
+from typing import Any, Tuple
+import argparse
+import asyncio
+import builtins
+import json
+import sys
+import time
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SERVICES = {
+    "sd": ("2_ml_inference/image_generation", "stable_diffusion", "SimpleSD"),
+    "vllm": ("2_ml_inference/llm_inference", "vllm_inference", "MinimalVLLM"),
+    "gpt-oss": ("2_ml_inference/llm_inference", "openai_gpt_oss_inference", "OpenAIGPTOSSInference"),
+    "tts": ("2_ml_inference/text-to-audio", "chatterbox_tts_inference", "ChatterboxTTSInference"),
+}
+
+
+def profile_init(cls, *args, **kwargs) -> Tuple[Any, dict]:
+    """
+    Create an instance of ``cls`` and report where its ``__init__`` spent time.
+
+    Returns:
+        Tuple of (instance, report). The report holds total init time, time
+        spent on first-time module imports, and the instance's own
+        ``startup_report`` when it has one.
+    """
+    original_import = builtins.__import__
+    import_time = {"s": 0.0, "depth": 0}
+
+    def timed_import(name, *import_args, **import_kwargs):
+        # Only time outermost imports of modules not loaded yet, to avoid double counting
+        if import_time["depth"] or name in sys.modules:
+            return original_import(name, *import_args, **import_kwargs)
+        import_time["depth"] += 1
+        start = time.perf_counter()
+        try:
+            return original_import(name, *import_args, **import_kwargs)
+        finally:
+            import_time["s"] += time.perf_counter() - start
+            import_time["depth"] -= 1
+
+    modules_before = len(sys.modules)
+    builtins.__import__ = timed_import
+    start = time.perf_counter()
+    try:
+        instance = cls(*args, **kwargs)
+    finally:
+        builtins.__import__ = original_import
+    init_s = time.perf_counter() - start
+
+    report = {
+        "class": cls.__name__,
+        "init_s": init_s,
+        "first_import_s": import_time["s"],
+        "modules_loaded": len(sys.modules) - modules_before,
+        "startup_report": getattr(instance, "startup_report", None),
+    }
+    return instance, report
+
+
+def load_service(name: str):
+    """Import the @remote-decorated class for a service name."""
+    directory, module_name, class_name = SERVICES[name]
+    sys.path.insert(0, str(REPO_ROOT / directory))
+    module = __import__(module_name)
+    return getattr(module, class_name)
+
+
+async def profile_remote(service_class, **kwargs) -> dict:
+    """Create a remote instance and time the first call, which pays for the cold start."""
+    instance = service_class(**kwargs)
+
+    start = time.perf_counter()
+    worker_report = await instance.get_startup_report()
+    return {
+        "client_first_call_s": time.perf_counter() - start,
+        "startup_report": worker_report,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile service cold starts")
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--remote", action="store_true",
+                        help="Profile the deployed service instead of an in-process instance")
+    parser.add_argument("--warmup", action="store_true", help="Include a warmup generation")
+    parser.add_argument("--model", help="Model to load locally (gpt-oss only)")
+    parser.add_argument("--fake", action="store_true",
+                        help="Use the fake vLLM engine (vllm only, no GPU needed)")
+    args = parser.parse_args()
+
+    kwargs = {"warmup": args.warmup}
+    if args.model:
+        kwargs["model_id"] = args.model
+
+    if args.fake:
+        sys.path.insert(0, str(REPO_ROOT / SERVICES["vllm"][0]))
+        from fake_vllm import install
+
+        install()
+
+    service_class = load_service(args.service)
+    if args.remote:
+        report = asyncio.run(profile_remote(service_class, **kwargs))
+    else:
+        # The @remote wrapper keeps the undecorated class, which runs in-process
+        _, report = profile_init(service_class(**kwargs)._class_type, **kwargs)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
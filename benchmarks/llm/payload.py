@@ -0,0 +1,77 @@
+"""
+LLM Batch Payload Benchmark
+
+Compares the wire size and client-side decode time of MinimalVLLM batch
+results in the default per-prompt dict format and the compact columnar format.
+It uses the fake vLLM engine, so no GPU is needed. Sizes are measured the way
+``@remote`` results travel: cloudpickle, then base64.
+
+USAGE:
+    python benchmarks/llm/payload.py --prompts 10000 --prompt-tokens 256
+"""
+
+import argparse
+import base64
+import contextlib
+import json
+import sys
+import time
+
+import cloudpickle
+
+from targets import LLM_INFERENCE_DIR, _import_from
+from workloads import make_requests
+
+
+def measure(label: str, result, decode) -> dict:
+    """Serialize a result as a remote call would, then time decoding it on the client."""
+    payload = base64.b64encode(cloudpickle.dumps(result))
+
+    start = time.perf_counter()
+    decode(cloudpickle.loads(base64.b64decode(payload)))
+    decode_s = time.perf_counter() - start
+
+    return {"format": label, "payload_bytes": len(payload), "decode_s": decode_s}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dict vs columnar batch result payloads")
+    parser.add_argument("--prompts", type=int, default=10000)
+    parser.add_argument("--prompt-tokens", default="fixed:256")
+    parser.add_argument("--output-tokens", type=int, default=50)
+    args = parser.parse_args()
+
+    _import_from(LLM_INFERENCE_DIR)
+    from fake_vllm import install
+
+    install(step_latency_s=0.0)
+    from vllm_inference import MinimalVLLM, decode_columnar
+
+    requests = make_requests(args.prompts, args.prompt_tokens, f"fixed:{args.output_tokens}")
+    prompts = [prompt for prompt, _ in requests]
+
+    with contextlib.redirect_stdout(sys.stderr):
+        llm = MinimalVLLM()._class_type()
+        dicts = llm.generate_batch(prompts)
+        compact = llm.generate_batch(prompts, compact=True)
+        compact_no_prompts = llm.generate_batch(prompts, compact=True, echo_prompts=False)
+        compact_token_ids = llm.generate_batch(
+            prompts, compact=True, echo_prompts=False, include_token_ids=True
+        )
+
+    rows = [
+        measure("dicts", dicts, lambda result: result),
+        measure("columnar", compact, decode_columnar),
+        measure("columnar, no prompt echo", compact_no_prompts,
+                lambda result: decode_columnar(result, prompts)),
+        measure("columnar, no prompt echo, packed token IDs", compact_token_ids,
+                lambda result: decode_columnar(result, prompts, include_token_ids=True)),
+    ]
+    baseline = rows[0]["payload_bytes"]
+    for row in rows:
+        row["size_vs_dicts"] = row["payload_bytes"] / baseline
+    print(json.dumps({"prompts": args.prompts, "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+LLM Throughput and Latency Benchmark
+
+Drives one of the LLM examples with a seeded workload at a fixed concurrency
+and reports requests/sec, output tokens/sec, and latency and time-to-first-token
+percentiles as JSON. A saved baseline can be compared against, and the script
+exits with status 1 if any metric regresses beyond the tolerance. A baseline
+recorded with a different target, backend or workload is refused (status 2).
+
+USAGE:
+    python benchmarks/llm/run.py --target vllm --backend fake
+    python benchmarks/llm/run.py --target llm-text --backend local \\
+        --model HuggingFaceTB/SmolLM2-135M-Instruct --requests 16 --concurrency 4
+    python benchmarks/llm/run.py --target vllm --backend fake --save-baseline baseline.json
+    python benchmarks/llm/run.py --target vllm --backend fake --baseline baseline.json
+"""
+
+from typing import List, Optional
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import sys
+import time
+
+from targets import TARGETS, create_target
+from workloads import make_requests
+
+# Metrics checked against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "requests_per_s": True,
+    "output_tokens_per_s": True,
+    "latency_s.p50": False,
+    "latency_s.p95": False,
+    "latency_s.p99": False,
+    "ttft_s.p50": False,
+    "ttft_s.p95": False,
+}
+
+
+async def run_benchmark(target, requests: list, concurrency: int) -> List[dict]:
+    """Send every request through the target, keeping ``concurrency`` in flight."""
+    queue = asyncio.Queue()
+    for index, request in enumerate(requests):
+        queue.put_nowait((index, request))
+    samples: List[Optional[dict]] = [None] * len(requests)
+
+    async def worker():
+        while not queue.empty():
+            index, (prompt, max_tokens) = queue.get_nowait()
+            started = time.perf_counter()
+            try:
+                result = await target.generate(prompt, max_tokens)
+            except Exception as e:
+                samples[index] = {"ok": False, "error": str(e)}
+                continue
+            latency_s = time.perf_counter() - started
+            # What the caller waits for the first token: everything except the worker's decoding after it,
+            # so queueing for the worker, the round trip and call overhead are included
+            client_ttft_s = None
+            if result["ttft_s"] is not None:
+                client_ttft_s = latency_s - result["decode_s"]
+            samples[index] = {
+                "ok": True,
+                "latency_s": latency_s,
+                "ttft_s": client_ttft_s,
+                "worker_ttft_s": result["ttft_s"],
+                "output_tokens": result["output_tokens"],
+            }
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(samples: List[dict], wall_time_s: float) -> dict:
+    """Aggregate per-request samples into throughput and latency percentiles."""
+    ok = [s for s in samples if s["ok"]]
+    ttfts = [s["ttft_s"] for s in ok if s["ttft_s"] is not None]
+    worker_ttfts = [s["worker_ttft_s"] for s in ok if s["worker_ttft_s"] is not None]
+    output_tokens = sum(s["output_tokens"] for s in ok)
+
+    return {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "wall_time_s": wall_time_s,
+        "requests_per_s": len(ok) / wall_time_s if wall_time_s else 0.0,
+        "output_tokens": output_tokens,
+        "output_tokens_per_s": output_tokens / wall_time_s if wall_time_s else 0.0,
+        "latency_s": _percentiles([s["latency_s"] for s in ok]),
+        "ttft_s": _percentiles(ttfts),
+        "worker_ttft_s": _percentiles(worker_ttfts),
+    }
+
+
+def compare(
+    current: dict,
+    baseline: dict,
+    tolerance: float,
+    tail_tolerance: Optional[float] = None,
+    min_latency_delta_s: float = 0.0,
+) -> List[dict]:
+    """
+    Compare metrics with a baseline summary; a change worse than its tolerance is a regression.
+
+    Tail percentiles (p95/p99) use ``tail_tolerance``, defaulting to ``tolerance``.
+    Latency changes smaller than ``min_latency_delta_s`` are treated as timer noise.
+    """
+    if tail_tolerance is None:
+        tail_tolerance = tolerance
+    rows = []
+    for metric, higher_is_better in COMPARED_METRICS.items():
+        now, before = _lookup(current, metric), _lookup(baseline, metric)
+        if now is None or not before:
+            continue
+        change = (now - before) / before
+        worse = -change if higher_is_better else change
+        limit = tail_tolerance if metric.endswith((".p95", ".p99")) else tolerance
+        is_latency = metric.startswith(("latency_s.", "ttft_s."))
+        rows.append({
+            "metric": metric,
+            "baseline": before,
+            "current": now,
+            "change": change,
+            "tolerance": limit,
+            "regressed": worse > limit and not (is_latency and abs(now - before) < min_latency_delta_s),
+        })
+    return rows
+
+
+def config_mismatch(current: dict, baseline: dict) -> dict:
+    """Settings that differ between two report configs, as {key: (baseline, current)}."""
+    return {
+        key: (baseline.get(key), current.get(key))
+        for key in sorted(set(current) | set(baseline))
+        if baseline.get(key) != current.get(key)
+    }
+
+
+def _percentiles(values: List[float]) -> Optional[dict]:
+    """Nearest-rank p50/p90/p95/p99 plus mean and max, or None without samples."""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+    return {
+        "p50": rank(50),
+        "p90": rank(90),
+        "p95": rank(95),
+        "p99": rank(99),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1],
+    }
+
+
+def _lookup(summary: dict, dotted: str):
+    value = summary
+    for key in dotted.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM inference examples")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="vllm")
+    parser.add_argument("--backend", choices=("fake", "local", "remote"), default="fake")
+    parser.add_argument("--model", help="Hugging Face model for the local backend")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests sent first")
+    parser.add_argument("--prompt-tokens", default="uniform:16:128",
+                        help="Prompt length distribution, e.g. fixed:64 or lognormal:128:0.5")
+    parser.add_argument("--output-tokens", default="uniform:16:64",
+                        help="Output length distribution")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fake-step-ms", type=float, default=10.0,
+                        help="Per-token decode time of the fake engines")
+    parser.add_argument("--fake-overhead-ms", type=float, default=50.0,
+                        help="Fixed per-call cost of the fake engines")
+    parser.add_argument("--output", help="Write the JSON report here as well as to stdout")
+    parser.add_argument("--baseline", help="Compare against a saved JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Allowed relative regression before failing")
+    parser.add_argument("--tail-tolerance", type=float, default=0.50,
+                        help="Allowed relative regression of p95/p99 latency and TTFT, which are noisier")
+    parser.add_argument("--min-latency-delta-ms", type=float, default=25.0,
+                        help="Latency and TTFT changes smaller than this never count as regressions")
+    parser.add_argument("--save-baseline", help="Save this run's report as a baseline")
+    args = parser.parse_args()
+
+    if args.requests < 1 or args.concurrency < 1:
+        parser.error("--requests and --concurrency must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup must be 0 or more")
+    return args
+
+
+async def main() -> int:
+    args = parse_args()
+    config = {
+        "target": args.target,
+        "backend": args.backend,
+        "model": args.model,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "warmup": args.warmup,
+        "prompt_tokens": args.prompt_tokens,
+        "output_tokens": args.output_tokens,
+        "seed": args.seed,
+        "fake_step_ms": args.fake_step_ms,
+        "fake_overhead_ms": args.fake_overhead_ms,
+    }
+
+    # Refuse to compare before spending time on a run that cannot be compared
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        mismatch = config_mismatch(config, baseline.get("config", {}))
+        if mismatch:
+            print(f"❌ Baseline {args.baseline} was recorded with different settings:", file=sys.stderr)
+            for key, (before, now) in mismatch.items():
+                print(f"   {key}: baseline {before!r}, current {now!r}", file=sys.stderr)
+            return 2
+
+    requests = make_requests(args.requests, args.prompt_tokens, args.output_tokens, args.seed)
+
+    # The services print progress; keep stdout for the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        target = create_target(
+            args.target,
+            args.backend,
+            model=args.model,
+            fake_step_latency_s=args.fake_step_ms / 1000,
+            fake_call_overhead_s=args.fake_overhead_ms / 1000,
+        )
+
+        if args.warmup:
+            await run_benchmark(target, requests[: args.warmup], 1)
+
+        started = time.perf_counter()
+        samples = await run_benchmark(target, requests, args.concurrency)
+        summary = summarize(samples, time.perf_counter() - started)
+
+    report = {"config": config, "summary": summary}
+    errors = [s["error"] for s in samples if not s["ok"]]
+    if errors:
+        report["first_errors"] = errors[:5]
+
+    regressed = False
+    if baseline is not None:
+        report["comparison"] = compare(
+            summary,
+            baseline["summary"],
+            args.tolerance,
+            tail_tolerance=args.tail_tolerance,
+            min_latency_delta_s=args.min_latency_delta_ms / 1000,
+        )
+        regressed = any(row["regressed"] for row in report["comparison"])
+
+    text = json.dumps(report, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+    print(text)
+
+    if regressed:
+        print("❌ Regression against baseline beyond tolerance", file=sys.stderr)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,77 @@
+"""
+Multi-Turn Session Benchmark
+
+Runs the same multi-turn conversation through OpenAIGPTOSSInference chat
+sessions twice. The first run keeps each session's key/value cache between
+turns. The second run has no cache budget, so every turn recomputes the whole
+conversation. With the cache, per-turn prefill time should stay roughly flat as
+the conversation grows. Without it, prefill time grows with every turn.
+
+USAGE:
+    python benchmarks/llm/sessions.py --model HuggingFaceTB/SmolLM2-135M-Instruct
+    python benchmarks/llm/sessions.py --model /path/to/tiny-model --turns 12 --turn-tokens 64
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+
+from targets import LLM_INFERENCE_DIR, _import_from
+from workloads import make_requests
+
+
+def run_conversation(llm, turns: list, max_new_tokens: int) -> list:
+    """Send each user turn through one session and collect per-turn timings."""
+    session_id = llm.start_session()
+    rows = []
+    for content in turns:
+        result = llm.chat(session_id, content, max_new_tokens=max_new_tokens)
+        rows.append({
+            "prompt_tokens": result["prompt_tokens"],
+            "reused_tokens": result["reused_tokens"],
+            "prefill_s": result["prefill_s"],
+            "reply": result["message"]["content"],
+        })
+    llm.end_session(session_id)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-turn prefill time with and without session caching")
+    parser.add_argument("--model", required=True, help="Hugging Face model to run locally on CPU")
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument("--turn-tokens", type=int, default=64, help="Words per user turn")
+    parser.add_argument("--max-new-tokens", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    _import_from(LLM_INFERENCE_DIR)
+    from openai_gpt_oss_inference import OpenAIGPTOSSInference
+
+    requests = make_requests(args.turns, f"fixed:{args.turn_tokens}", "fixed:1", args.seed)
+    turns = [prompt for prompt, _ in requests]
+
+    with contextlib.redirect_stdout(sys.stderr):
+        service_class = OpenAIGPTOSSInference()._class_type
+        cached = run_conversation(service_class(model_id=args.model), turns, args.max_new_tokens)
+        recomputed = run_conversation(
+            service_class(model_id=args.model, session_cache_mb=0), turns, args.max_new_tokens
+        )
+
+    rows = []
+    for turn, (hit, miss) in enumerate(zip(cached, recomputed), start=1):
+        rows.append({
+            "turn": turn,
+            "prompt_tokens": hit["prompt_tokens"],
+            "reused_tokens": hit["reused_tokens"],
+            "prefill_s_cached": hit["prefill_s"],
+            "prefill_s_recomputed": miss["prefill_s"],
+            # With greedy decoding, cache reuse must not change the replies
+            "same_reply": hit["reply"] == miss["reply"],
+        })
+    print(json.dumps({"model": args.model, "turns": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark Targets
+
+Adapters that give each LLM example the same async interface:
+``await target.generate(prompt, max_tokens)`` returns the number of output
+tokens and, where the service measures it, the worker's time to first token
+(``ttft_s``) and how long it kept decoding after that (``decode_s``). Only
+``MinimalVLLM`` measures these; the other targets return None for both, since
+their services answer with one complete response and no token timings.
+
+Backends:
+
+- ``fake``: deterministic local stand-ins (fake vLLM engine, stub LLM service)
+- ``local``: the undecorated class running in-process on a tiny CPU model
+- ``remote``: the deployed ``@remote`` class on Runpod
+
+Local instances are wrapped in a single-worker async proxy, so concurrent
+requests queue the way they would on a ``workersMax=1`` endpoint.
+"""
+
+from pathlib import Path
+from typing import Optional
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+LLM_INFERENCE_DIR = REPO_ROOT / "2_ml_inference" / "llm_inference"
+LLM_TO_TTS_DIR = REPO_ROOT / "3_workflows" / "llm_to_tts"
+
+TARGETS = {
+    "vllm": ("fake", "remote"),
+    "gpt-oss": ("local", "remote"),
+    "llm-text": ("fake", "local", "remote"),
+}
+
+
+def _import_from(directory: Path) -> None:
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+
+def _local_worker(instance):
+    _import_from(LLM_INFERENCE_DIR)
+    from fake_vllm import LocalWorker
+
+    return LocalWorker(instance)
+
+
+class VLLMTarget:
+    """MinimalVLLM, timed through its streaming path."""
+
+    def __init__(self, backend: str, step_latency_s: float, call_overhead_s: float) -> None:
+        _import_from(LLM_INFERENCE_DIR)
+        if backend == "fake":
+            from fake_vllm import install
+
+            install(step_latency_s=step_latency_s, call_overhead_s=call_overhead_s)
+
+        from vllm_inference import MinimalVLLM
+
+        self.llm = MinimalVLLM()
+        if backend == "fake":
+            self.llm = _local_worker(self.llm._class_type())
+
+    async def generate(self, prompt: str, max_tokens: int) -> dict:
+        results = await self.llm.generate_batch_timed(
+            [prompt], sampling=[{"max_tokens": max_tokens}]
+        )
+        result = results[0]
+        decode_s = (result["mean_itl_s"] or 0.0) * max(0, result["tokens"] - 1)
+        return {"output_tokens": result["tokens"], "ttft_s": result["ttft_s"], "decode_s": decode_s}
+
+
+class GPTOSSTarget:
+    """OpenAIGPTOSSInference with a single-turn conversation per request."""
+
+    def __init__(self, backend: str, model: Optional[str]) -> None:
+        _import_from(LLM_INFERENCE_DIR)
+        from openai_gpt_oss_inference import OpenAIGPTOSSInference
+
+        if backend == "local":
+            self.llm = _local_worker(OpenAIGPTOSSInference()._class_type(model_id=model))
+        else:
+            self.llm = OpenAIGPTOSSInference()
+
+    async def generate(self, prompt: str, max_tokens: int) -> dict:
+        messages = [{"role": "user", "content": prompt}]
+        results = await self.llm.generate_many([messages], max_new_tokens=max_tokens, batch_size=1)
+        return {"output_tokens": results[0]["completion_tokens"], "ttft_s": None, "decode_s": None}
+
+
+class LLMTextTarget:
+    """LLMTextGenerator from the llm_to_tts workflow."""
+
+    def __init__(self, backend: str, model: Optional[str], stub_latency_s: float) -> None:
+        _import_from(LLM_TO_TTS_DIR)
+        if backend == "fake":
+            from stub_services import StubLLMTextGenerator
+
+            self.llm = StubLLMTextGenerator(latency_s=stub_latency_s)
+            return
+
+        from llm_service import LLMTextGenerator
+
+        if backend == "local":
+            self.llm = _local_worker(
+                LLMTextGenerator(model_name=model)._class_type(model_name=model, device_map="cpu")
+            )
+        else:
+            self.llm = LLMTextGenerator()
+
+    async def generate(self, prompt: str, max_tokens: int) -> dict:
+        result = await self.llm.generate_text(prompt, max_new_tokens=max_tokens)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error"))
+        return {"output_tokens": result["tokens_generated"], "ttft_s": None, "decode_s": None}
+
+
+def create_target(
+    name: str,
+    backend: str,
+    model: Optional[str] = None,
+    fake_step_latency_s: float = 0.01,
+    fake_call_overhead_s: float = 0.05,
+):
+    """
+    Create a benchmark target.
+
+    Args:
+        name: ``vllm``, ``gpt-oss`` or ``llm-text``
+        backend: ``fake``, ``local`` or ``remote``; see ``TARGETS`` for the
+            backends each target supports
+        model: Hugging Face model for the ``local`` backend
+        fake_step_latency_s: Per-token decode time of the fake engines
+        fake_call_overhead_s: Fixed per-call cost of the fake engines
+    """
+    if name not in TARGETS:
+        raise ValueError(f"Unknown target '{name}', expected one of {sorted(TARGETS)}")
+    if backend not in TARGETS[name]:
+        raise ValueError(f"Target '{name}' supports backends {TARGETS[name]}, not '{backend}'")
+    if backend == "local" and not model:
+        raise ValueError("The local backend needs --model")
+
+    if name == "vllm":
+        return VLLMTarget(backend, fake_step_latency_s, fake_call_overhead_s)
+    if name == "gpt-oss":
+        return GPTOSSTarget(backend, model)
+    return LLMTextTarget(backend, model, fake_call_overhead_s)
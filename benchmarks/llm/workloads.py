@@ -0,0 +1,78 @@
+"""
+Benchmark Workloads
+
+Seeded prompt- and output-length distributions for the LLM benchmarks.
+Distributions are written as ``kind:params``:
+
+- ``fixed:64``: always 64
+- ``uniform:16:256``: uniform between 16 and 256 (inclusive)
+- ``normal:128:32``: normal with mean 128 and standard deviation 32
+- ``lognormal:128:0.5``: log-normal with median 128 and sigma 0.5
+
+Lengths are in tokens and are clamped to at least 1. Prompts are built from
+common words, roughly one token per word.
+"""
+
+from typing import Callable, List, Tuple
+import math
+import random
+
+WORDS = (
+    "please explain how modern systems handle large amounts of data while "
+    "keeping latency low and throughput high for many users at once"
+).split()
+
+Distribution = Callable[[random.Random], int]
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """Turn a ``kind:params`` spec into a function that samples a length."""
+    kind, *params = spec.split(":")
+    try:
+        values = [float(p) for p in params]
+    except ValueError:
+        raise ValueError(f"Invalid distribution parameters in '{spec}'") from None
+
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if kind not in expected:
+        raise ValueError(f"Unknown distribution '{kind}', expected one of {sorted(expected)}")
+    if len(values) != expected[kind]:
+        raise ValueError(f"'{kind}' takes {expected[kind]} parameter(s), got '{spec}'")
+
+    if kind == "fixed":
+        sample = lambda rng: values[0]
+    elif kind == "uniform":
+        sample = lambda rng: rng.randint(int(values[0]), int(values[1]))
+    elif kind == "normal":
+        sample = lambda rng: rng.gauss(values[0], values[1])
+    else:
+        sample = lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+
+    return lambda rng: max(1, int(round(sample(rng))))
+
+
+def make_requests(
+    count: int, prompt_tokens: str, output_tokens: str, seed: int = 0
+) -> List[Tuple[str, int]]:
+    """
+    Build a reproducible list of benchmark requests.
+
+    Args:
+        count: Number of requests
+        prompt_tokens: Distribution spec for prompt lengths
+        output_tokens: Distribution spec for requested output lengths
+        seed: Random seed; the same seed always yields the same workload
+
+    Returns:
+        List of ``(prompt, max_output_tokens)`` pairs
+    """
+    rng = random.Random(seed)
+    prompt_length = parse_distribution(prompt_tokens)
+    output_length = parse_distribution(output_tokens)
+
+    requests = []
+    for i in range(count):
+        length = prompt_length(rng)
+        words = [WORDS[(i + j) % len(WORDS)] for j in range(length)]
+        requests.append((" ".join(words), output_length(rng)))
+    return requests